@@ -11,591 +11,415 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
+import functools
+import os
+import re
+import threading
+import time
 
-import requests
 from adapt.intent import IntentBuilder
 from mycroft import MycroftSkill, intent_handler
+from mycroft.messagebus.message import Message
+
+from . import bravia_client
+from .bravia_client.apps import AppCatalog
+from .bravia_client.content import ChannelIndex
+from .bravia_client.discovery import DeviceRegistry, SsdpDiscovery
+from .bravia_client.errors import BraviaError, CircuitOpenError, NotConfiguredError
+from .bravia_client.executor import INPUT, POWER, CommandExecutor
+from .bravia_client.fleet import BraviaFleet
+from .bravia_client.ircc import IrccRemote
+from .bravia_client.numbers import parse_number
+from .bravia_client.power import PowerOn
+from .bravia_client.profile import DeviceProfile
+from .bravia_client.state import StateMirror
+from .bravia_client.tracing import tracer
+from .bravia_client.volume import VolumeController
+
+# The tv_ip value settingsmeta.json starts with.
+TV_IP_PLACEHOLDER = "192.168.1.XXX"
+
+# Seconds between searches for a TV that stopped answering.
+REDISCOVER_INTERVAL = 30.0
+
+
+def traced_intent(handler):
+    """Open a span around an intent handler when tracing is on, preceded
+    by one for the time from the utterance to the handler (Adapt matching
+    plus the message bus)."""
+    @functools.wraps(handler)
+    def wrapper(self, message):
+        if not tracer.enabled:
+            return handler(self, message)
+        if self.heard_at is not None:
+            tracer.record('intent.match', self.heard_at, time.monotonic(), 'intent', intent=handler.__name__)
+            self.heard_at = None
+        with tracer.span(handler.__name__, 'intent', data=dict(message.data)):
+            return handler(self, message)
+    return wrapper
+
+
+def needs_tv(handler):
+    """Answer "tv.unreachable" instead of running an intent handler while no
+    TV is known (none configured and none discovered yet), and look again."""
+    @functools.wraps(handler)
+    def wrapper(self, message):
+        if self.profile is None:
+            self.speak_dialog("tv.unreachable")
+            self.discovery.search_in_background(self.on_tvs_found)
+            return None
+        return handler(self, message)
+    return wrapper
 
 
 class BraviaSkill(MycroftSkill):
 
     def initialize(self):
-        global base_url
-        base_url = 'http://' + self.settings.get("tv_ip") + "/sony/"
-        global key
-        key = self.settings.get("tv_password")
+        self.heard_at = None
+        self.rediscovered_at = -REDISCOVER_INTERVAL
+        if self.settings.get("trace"):
+            tracer.enable()
+            self.add_event('recognizer_loop:utterance', self.on_utterance)
+        self.registry = DeviceRegistry(os.path.join(self.file_system.path, 'devices.json'))
+        self.discovery = SsdpDiscovery(self.registry, identify=self.identify_tv)
+        self.commands = CommandExecutor()
+        self.fleet = BraviaFleet()
+        for host in (self.settings.get("other_tvs") or "").split(","):
+            if host.strip():
+                self.fleet.add(bravia_client.BraviaClient(host.strip(), self.settings.get("tv_password"),
+                                                          metrics=bravia_client.metrics,
+                                                          latency_budget=self.latency_budget))
+        self.profile = None
+        self.channels = ChannelIndex(bravia_client)
+        self.remote = IrccRemote(bravia_client)
+        self.schedule_repeating_event(self.refresh_channels, None, 3600, name='RefreshChannels')
+        self.apps = AppCatalog(bravia_client)
+        self.schedule_repeating_event(self.refresh_apps, None, 600, name='RefreshApps')
+        self.state = StateMirror(bravia_client,
+                                 fast_interval=self.settings.get("poll_fast_interval", 1.0),
+                                 slow_interval=self.settings.get("poll_slow_interval", 30.0),
+                                 standby_interval=self.settings.get("poll_standby_interval", 60.0),
+                                 max_staleness=self.settings.get("state_max_staleness", 120.0))
+        self.state.subscribe(self.on_tv_state_changed)
+        self.volume = VolumeController(bravia_client, self.state, on_error=self.on_command_failed,
+                                       executor=self.commands)
+        host = self.configured_host()
+        if host:
+            self.use_tv(host)
+        self.discovery.search_in_background(self.on_tvs_found)
+        self.add_event('bravia.metrics.get', self.handle_metrics_query)
+        self.add_event('bravia.trace.dump', self.handle_trace_dump)
+        if self.settings.get("prewarm", True):
+            self.add_event('recognizer_loop:wakeword', self.prewarm)
+            self.add_event('recognizer_loop:record_begin', self.prewarm)
+
+    @property
+    def latency_budget(self):
+        """Longest a single request to the TV may take, in seconds."""
+        return float(self.settings.get("latency_budget") or 4.0)
+
+    def identify_tv(self, host):
+        client = bravia_client.BraviaClient(host, self.settings.get("tv_password"), latency_budget=self.latency_budget)
+        try:
+            info = bravia_client.result(client.get_system_information())[0]
+        finally:
+            client.close()
+        return info.get("serial") or info.get("macAddr")
+
+    def configured_host(self):
+        """The TV's address from the settings, else the first TV discovered
+        on an earlier run, else None."""
+        tv_ip = (self.settings.get("tv_ip") or "").strip()
+        if tv_ip and tv_ip != TV_IP_PLACEHOLDER:
+            return tv_ip
+        return next((d['host'] for d in self.registry.devices().values()), None)
+
+    def use_tv(self, host):
+        """Talk to the TV at `host` from now on, starting from its saved profile."""
+        if self.fleet.clients.get(bravia_client.client.host) is bravia_client.client:
+            self.fleet.remove(bravia_client.client.host)
+        bravia_client.configure(host, self.settings.get("tv_password"), latency_budget=self.latency_budget)
+        self.fleet.add(bravia_client.client)
+        self.profile = DeviceProfile(self.file_system.path, host, bravia_client)
+        # The versions saved last time, until revalidation confirms them:
+        # the TV may well be off or unreachable right now.
+        bravia_client.client.capabilities = self.profile.capabilities
+        self.remote = IrccRemote(bravia_client, self.profile.remote_codes)
+        self.profile.revalidate_in_background(on_error=self.log_profile_error, on_done=self.on_profile_ready)
+        self.state.start()
+        self.commands.submit(self.refresh_channels)
+        self.commands.submit(self.refresh_apps)
+
+    def tv_key(self):
+        info = self.profile.system_information if self.profile is not None else {}
+        return info.get("serial") or info.get("macAddr")
+
+    def on_tvs_found(self, keys):
+        if self.profile is None:
+            # No address was configured: adopt the TV just found.
+            host = next((self.registry.host(key) for key in keys), None) or self.configured_host()
+            if host:
+                self.log.info("Using the TV found at %s", host)
+                self.use_tv(host)
+            return
+        host = self.registry.host(self.tv_key()) if self.tv_key() else None
+        if host and host != bravia_client.client.host:
+            self.log.info("TV moved from %s to %s", bravia_client.client.host, host)
+            self.fleet.remove(bravia_client.client.host)
+            bravia_client.configure(host, self.settings.get("tv_password"), latency_budget=self.latency_budget)
+            bravia_client.client.capabilities = self.profile.capabilities
+            self.fleet.add(bravia_client.client)
+
+    def handle_metrics_query(self, message):
+        """Answers with request metrics, or Prometheus text if asked for
+        format "prometheus"."""
+        if message.data.get('format') == 'prometheus':
+            data = {'text': bravia_client.metrics.prometheus()}
+        else:
+            data = {
+                'requests': bravia_client.metrics.snapshot(),
+                'first_requests': bravia_client.metrics.first_requests(),
+                'cache': bravia_client.cache.stats(),
+                'volume': self.volume.stats(),
+                'queue': self.commands.stats(),
+                'health': bravia_client.connection.breaker.stats()
+            }
+        self.bus.emit(message.response(data))
+
+    def prewarm(self, message=None):
+        """Connect to the TV while the user is still speaking."""
+        if self.profile is None:
+            return
+        threading.Thread(target=self.warm_connection, name='bravia-prewarm', daemon=True).start()
+
+    def warm_connection(self):
+        try:
+            response = bravia_client.connection.warm()
+            if response is None:
+                return
+            power = bravia_client.result(response)[0]["status"]
+        except (BraviaError, OSError, IndexError, KeyError) as e:
+            self.log.debug("Could not pre-open the TV connection: %s", e)
+            return
+        self.state.update(power=power)
+        if power == "active" and self.settings.get("prewarm_refresh_state", True) \
+                and self.state.get('volume') is None:
+            self.state.poke()
+
+    def on_utterance(self, message):
+        self.heard_at = time.monotonic()
+
+    def handle_trace_dump(self, message):
+        path = os.path.join(self.file_system.path, 'bravia-trace.json')
+        spans = tracer.export(path) if tracer.enabled else 0
+        self.bus.emit(message.response({'path': path if spans else None, 'spans': spans}))
+
+    def speak_dialog(self, key, *args, **kwargs):
+        with tracer.span('speak_dialog', 'speech', dialog=key):
+            return super(BraviaSkill, self).speak_dialog(key, *args, **kwargs)
+
+    def on_profile_ready(self):
+        # Revalidated (or re-probed): from now on calls use the versions
+        # this TV supports.
+        bravia_client.client.capabilities = self.profile.capabilities
+        # PowerOn reads the WoL mode from the cache only: fill it while the TV is up.
+        self.commands.submit(bravia_client.get_wol_mode)
+
+    def log_profile_error(self, error):
+        self.log.warning("Could not probe the TV: %s", error)
+
+    def refresh_channels(self):
+        if self.profile is None:
+            return
+        try:
+            self.channels.refresh()
+        except (BraviaError, OSError) as e:
+            self.log.warning("Could not read the channel list: %s", e)
+
+    def send(self, func, *args):
+        self.commands.submit(func, *args, on_done=self.on_command_done, on_error=self.on_command_failed)
+
+    def on_command_done(self, response):
+        self.state.poke()
+
+    def on_command_failed(self, error):
+        self.log.warning("TV command failed: %s", error)
+        if isinstance(error, (CircuitOpenError, NotConfiguredError)):
+            self.speak_dialog("tv.unreachable")
+        else:
+            self.speak_dialog("command.failed")
+        if isinstance(error, (OSError, CircuitOpenError)):
+            self.rediscover()
+
+    def rediscover(self):
+        """Search for the TV again, as it may have a new address from DHCP.
+        At most once every REDISCOVER_INTERVAL seconds: while the circuit is
+        open every command fails the same way."""
+        now = time.monotonic()
+        if now - self.rediscovered_at < REDISCOVER_INTERVAL:
+            return
+        self.rediscovered_at = now
+        self.discovery.search_in_background(self.on_tvs_found)
+
+    def on_tv_state_changed(self, field, old, new):
+        self.bus.emit(Message('bravia.state.changed', {'field': field, 'value': new}))
+
+    def refresh_apps(self):
+        if self.profile is None:
+            return
+        try:
+            self.apps.refresh_if_changed()
+        except (BraviaError, OSError) as e:
+            self.log.warning("Could not read the application list: %s", e)
+
+    def wake_tv(self):
+        # The MAC comes from the profile: an asleep TV cannot be asked for it.
+        mac = self.profile.system_information.get("macAddr") if self.profile is not None else None
+        if not PowerOn(bravia_client, self.commands, self.state, mac=mac).run():
+            self.speak_dialog("command.failed")
+
+    @intent_handler(IntentBuilder('PowerOnIntent').require('TV').require('On'))
+    @traced_intent
+    @needs_tv
+    def handle_power_on_intent(self, message):
+        threading.Thread(target=self.wake_tv, name='bravia-wake', daemon=True).start()
+        self.speak_dialog("turning.on")
+
+    @intent_handler(IntentBuilder('PowerOffIntent').require('TV').require('Off'))
+    @traced_intent
+    @needs_tv
+    def handle_power_off_intent(self, message):
+        self.send(bravia_client.power_off)
+        self.speak_dialog("turning.off")
+
+    def power_off_all(self):
+        outcome = self.fleet.power_off(timeout=10)
+        self.log.info("Turned off %d TVs in %.2fs", len(outcome.results), outcome.wall_time)
+        if not outcome.ok:
+            self.speak_dialog("fleet.failed", {'count': len(outcome.errors)})
+
+    @intent_handler(IntentBuilder('PowerOffAllIntent').require('All').require('TV').require('Off'))
+    @traced_intent
+    def handle_power_off_all_intent(self, message):
+        self.commands.submit(self.power_off_all, priority=POWER)
+        self.speak_dialog("turning.off.all")
 
     @intent_handler(IntentBuilder('ChannelIntent').require('Channel').optionally('Number'))
+    @traced_intent
+    @needs_tv
     def handle_change_channel_intent(self, message):
-        channel_number = message.data.get("Number")
-        self.speak_dialog("change.channel", {'number': channel_number})
+        # The regex takes the rest of the utterance: "twenty three please".
+        spoken = message.data.get("Number")
+        if not len(self.channels):
+            # The channel list has to be read first: do it on the executor,
+            # together with the tuning, rather than on the bus thread.
+            self.commands.submit(self.change_channel, spoken, priority=INPUT, key='input',
+                                 on_done=self.on_command_done, on_error=self.on_command_failed)
+            return
+        command = self.channel_command(spoken)
+        if command is None:
+            self.speak_dialog("channel.not.found", {'number': spoken})
+            return
+        channel, func, arg = command
+        self.commands.submit(func, arg, priority=INPUT, key='input',
+                             on_done=self.on_command_done, on_error=self.on_command_failed)
+        self.speak_dialog("change.channel", {'number': channel})
+
+    def channel_command(self, spoken):
+        """What tunes the channel in `spoken`: (channel to announce,
+        function, argument), or None.
+
+        The words are looked up as the TV's own channel numbers first
+        ("2-1", "7.1"), then as a channel name when they do not start with
+        a number ("bbc one"), and only then read as a spoken number.
+        """
+        if not spoken:
+            return None
+        words = spoken.split()
+        candidates = [spoken]
+        if re.match(r'\d+[.\-]\d+$', words[0]):
+            # "2-1 please": a sub-channel followed by other words.
+            candidates.append(words[0])
+        for candidate in candidates:
+            uri = self.channels.uri_for_number(candidate)
+            if uri is not None:
+                return candidate, bravia_client.set_play_content, uri
+        if parse_number(words[0], self.lang) is None:
+            # "bbc one please": the longest run of leading words that names a channel.
+            for end in range(len(words), 0, -1):
+                uri = self.channels.uri_for_name(' '.join(words[:end]))
+                if uri is not None:
+                    return ' '.join(words[:end]), bravia_client.set_play_content, uri
+        number = parse_number(spoken, self.lang)
+        if number is None:
+            return None
+        uri = self.channels.uri_for_number(str(number))
+        if uri is not None:
+            return str(number), bravia_client.set_play_content, uri
+        # Not in the channel list (e.g. a service the TV has not scanned):
+        # type the number on the remote instead.
+        return str(number), self.remote.send_channel, str(number)
+
+    def change_channel(self, spoken):
+        """Reads the channel list, then tunes. Runs on the executor."""
+        self.refresh_channels()
+        command = self.channel_command(spoken)
+        if command is None:
+            self.speak_dialog("channel.not.found", {'number': spoken})
+            return None
+        channel, func, arg = command
+        self.speak_dialog("change.channel", {'number': channel})
+        return func(arg)
+
+    @intent_handler(IntentBuilder('OpenAppIntent').require('Open').require('App').require('TV'))
+    @traced_intent
+    @needs_tv
+    def handle_open_app_intent(self, message):
+        name = message.data.get("App")
+        if not len(self.apps):
+            # As for channels: read the catalog on the executor.
+            self.commands.submit(self.open_app, name, priority=INPUT, key='input',
+                                 on_done=self.on_command_done, on_error=self.on_command_failed)
+            return
+        app = self.apps.resolve(name)
+        if app is None:
+            self.speak_dialog("app.not.found", {'app': name})
+            return
+        self.send(bravia_client.set_active_app, app["uri"])
+        self.speak_dialog("opening.app", {'app': app["title"]})
+
+    def open_app(self, name):
+        """Reads the application list, then opens `name`. Runs on the executor."""
+        self.refresh_apps()
+        app = self.apps.resolve(name)
+        if app is None:
+            self.speak_dialog("app.not.found", {'app': name})
+            return None
+        self.speak_dialog("opening.app", {'app': app["title"]})
+        return bravia_client.set_active_app(app["uri"])
 
     @intent_handler(IntentBuilder('VolumeUpIntent').require('TV').require('Volume').require('Up'))
-    def handle_change_channel_intent(self, message):
+    @traced_intent
+    @needs_tv
+    def handle_volume_up_intent(self, message):
+        self.volume.up()
         self.speak_dialog("volume.up")
-        volume_raise()
 
     @intent_handler(IntentBuilder('VolumeDownIntent').require('TV').require('Volume').require('Down'))
-    def handle_change_channel_intent(self, message):
+    @traced_intent
+    @needs_tv
+    def handle_volume_down_intent(self, message):
+        self.volume.down()
         self.speak_dialog("volume.down")
-        volume_lower()
+
+    def shutdown(self):
+        self.volume.flush()
+        self.commands.stop()
+        self.state.stop()
+        self.fleet.close()
+        if tracer.enabled:
+            tracer.export(os.path.join(self.file_system.path, 'bravia-trace.json'))
 
 
 def create_skill():
     return BraviaSkill()
-
-
-base_url = 'http://192.168.1.208/sony/'
-key = 'a4G2H3f3sd5G8JU2'
-
-headers = {
-    'X-Auth-PSK': key
-}
-
-
-# COMMON METHODS
-
-
-def post_request(url, data):
-    return requests.post(url, data=json.dumps(data).encode("UTF-8"), headers=headers)
-
-
-# GUIDE SERVICE
-
-
-guide_url = base_url + 'guide'
-
-
-def get_supported_api_info():
-    data = {
-        "method": "getSupportedApiInfo",
-        "id": 101,
-        "params": [{
-            "services": ["system", "avContent"]
-        }],
-        "version": "1.0"
-    }
-    return post_request(guide_url, data)
-
-
-# APP CONTROL SERVICE
-
-
-app_control_url = base_url + 'appControl'
-
-
-def get_application_list():
-    data = {
-        "method": "getApplicationList",
-        "id": 201,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(app_control_url, data)
-
-
-def get_application_status_list():
-    data = {
-        "method": "getApplicationStatusList",
-        "id": 202,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(app_control_url, data)
-
-
-def get_text_form():
-    data = {
-        "method": "getTextForm",
-        "id": 203,
-        "params": [{}],
-        "version": "1.1"
-    }
-
-    return post_request(app_control_url, data)
-
-
-def get_web_app_status():
-    data = {
-        "method": "getWebAppStatus",
-        "id": 204,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(app_control_url, data)
-
-
-def set_active_app(uri):
-    data = {
-        "method": "setActiveApp",
-        "id": 205,
-        "params": [{
-            "uri": uri
-        }],
-        "version": "1.0"
-    }
-
-    return post_request(app_control_url, data)
-
-
-def set_text_form(text):
-    data = {
-        "method": "setTextForm",
-        "id": 206,
-        "params": [{
-            "encKey": "",
-            "text": text
-        }],
-        "version": "1.1"
-    }
-
-    return post_request(app_control_url, data)
-
-
-def terminate_apps():
-    data = {
-        "method": "terminateApps",
-        "id": 207,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(app_control_url, data)
-
-
-# AUDIO SERVICE
-
-
-audio_url = base_url + 'audio'
-
-
-def get_sound_settings():
-    data = {
-        "method": "getSoundSettings",
-        "id": 301,
-        "params": [{"target": ""}],
-        "version": "1.1"
-    }
-
-    return post_request(audio_url, data)
-
-
-def get_speaker_settings():
-    data = {
-        "method": "getSpeakerSettings",
-        "id": 302,
-        "params": [{"target": ""}],
-        "version": "1.0"
-    }
-
-    return post_request(audio_url, data)
-
-
-def get_volume_information():
-    data = {
-        "method": "getVolumeInformation",
-        "id": 303,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(audio_url, data)
-
-
-def set_audio_mute(status):
-    data = {
-        "method": "setAudioMute",
-        "id": 304,
-        "params": [{
-            "status": status
-        }],
-        "version": "1.0",
-    }
-
-    return post_request(audio_url, data)
-
-
-def mute():
-    return set_audio_mute(True)
-
-
-def unmute():
-    return set_audio_mute(False)
-
-
-def set_audio_volume(volume):
-    data = {
-        "method": "setAudioVolume",
-        "id": 305,
-        "params": [{
-            "volume": volume,
-            "ui": "on",
-            "target": "speaker"
-        }],
-        "version": "1.2"
-    }
-
-    return post_request(audio_url, data)
-
-
-def volume_raise():
-    set_audio_volume('+2')
-
-
-def volume_lower():
-    set_audio_volume('-2')
-
-
-def set_sound_settings(settings):
-    data = {
-        "method": "setSoundSettings",
-        "id": 306,
-        "params": [{"settings": settings}],
-        "version": "1.1"
-    }
-
-    return post_request(audio_url, data)
-
-
-def set_speaker_settings(settings):
-    data = {
-        "method": "setSpeakerSettings",
-        "id": 307,
-        "params": [{"settings": settings}],
-        "version": "1.0"
-    }
-
-    return post_request(audio_url, data)
-
-
-# AV CONTENT SERVICE
-
-
-av_content_url = base_url + 'avContent'
-
-
-def get_content_count(source, type, target):
-    data = {
-        "method": "getContentCount",
-        "id": 401,
-        "params": [{
-            "source": source,
-            "type": type,
-            "target": target
-        }],
-        "version": "1.0"
-    }
-
-    return post_request(av_content_url, data)
-
-
-def get_content_list(uri, st_idx, cnt):
-    data = {
-        "method": "getContentList",
-        "id": 402,
-        "params": [{
-            "uri": uri,
-            "stIdx": st_idx,
-            "cnt": cnt
-        }],
-        "version": "1.5"
-    }
-
-    return post_request(av_content_url, data)
-
-
-def get_current_external_inputs_status():
-    data = {
-        "method": "getCurrentExternalInputsStatus",
-        "id": 403,
-        "params": [],
-        "version": "1.1"
-    }
-
-    return post_request(av_content_url, data)
-
-
-def get_scheme_list():
-    data = {
-        "method": "getSchemeList",
-        "id": 404,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(av_content_url, data)
-
-
-def get_source_list(scheme):
-    data = {
-        "method": "getSourceList",
-        "id": 405,
-        "params": [{"scheme": scheme}],
-        "version": "1.0"
-    }
-
-    return post_request(av_content_url, data)
-
-
-def get_playing_content_info():
-    data = {
-        "method": "getPlayingContentInfo",
-        "id": 406,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(av_content_url, data)
-
-
-def set_play_content(uri):
-    data = {
-        "method": "setPlayContent",
-        "id": 407,
-        "params": [{"uri": uri}],
-        "version": "1.0"
-    }
-
-    return post_request(av_content_url, data)
-
-
-# ENCRYPTION SERVICE
-
-
-encryption_url = base_url + 'encryption'
-
-
-def get_public_key():
-    data = {
-        "method": "getPublicKey",
-        "id": 501,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(encryption_url, data)
-
-
-# SYSTEM SERVICE
-
-
-system_url = base_url + 'system'
-
-
-def get_current_time():
-    data = {
-        "method": "getCurrentTime",
-        "id": 601,
-        "params": [],
-        "version": "1.1"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_interface_information():
-    data = {
-        "method": "getInterfaceInformation",
-        "id": 602,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_led_indicator_status():
-    data = {
-        "method": "getLEDIndicatorStatus",
-        "id": 603,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_network_settings():
-    data = {
-        "method": "getNetworkSettings",
-        "id": 604,
-        "params": [{"netif": ""}],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_power_saving_mode():
-    data = {
-        "method": "getPowerSavingMode",
-        "id": 605,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_power_status():
-    data = {
-        "method": "getPowerStatus",
-        "id": 606,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_remote_controller_info():
-    data = {
-        "method": "getRemoteControllerInfo",
-        "id": 607,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_remote_device_settings():
-    data = {
-        "method": "getRemoteDeviceSettings",
-        "id": 608,
-        "params": [{"target": ""}],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_system_information():
-    data = {
-        "method": "getSystemInformation",
-        "id": 609,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_system_supported_function():
-    data = {
-        "method": "getSystemSupportedFunction",
-        "id": 610,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def get_wol_mode():
-    data = {
-        "method": "getWolMode",
-        "id": 611,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def request_reboot():
-    data = {
-        "method": "requestReboot",
-        "id": 612,
-        "params": [],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def set_led_indicator_status(mode, status):
-    data = {
-        "method": "setLEDIndicatorStatus",
-        "id": 613,
-        "params": [{
-            "mode": mode,
-            "status": status
-        }],
-        "version": "1.1"
-    }
-
-    return post_request(system_url, data)
-
-
-def set_language(language):
-    data = {
-        "method": "setLanguage",
-        "id": 614,
-        "params": [{"language": language}],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def set_power_saving_mode(mode):
-    data = {
-        "method": "setPowerSavingMode",
-        "id": 615,
-        "params": [{"mode": mode}],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def set_power_status(status):
-    data = {
-        "method": "setPowerStatus",
-        "id": 616,
-        "params": [{"status": status}],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-def power_on():
-    return set_power_status(True)
-
-
-def power_off():
-    return set_power_status(False)
-
-
-def set_wol_mode(mode):
-    data = {
-        "method": "setWolMode",
-        "id": 617,
-        "params": [{"enabled": mode}],
-        "version": "1.0"
-    }
-
-    return post_request(system_url, data)
-
-
-# VIDEO SCREEN SERVICE
-
-
-video_screen_url = base_url + 'videoScreen'
-
-
-def set_scene_setting(scene):
-    data = {
-        "method": "setSceneSetting",
-        "id": 701,
-        "params": [{"value": scene}],
-        "version": "1.0"
-    }
-
-    return post_request(video_screen_url, data)
@@ -0,0 +1,76 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Channel list walks against simulated TVs with 1k to 10k channels: a full
+# ChannelIndex build, a refresh with nothing changed, and a lookup.
+#
+#     python benchmarks/bench_content.py [latency seconds]
+
+import sys
+import time
+
+import timing  # noqa: F401
+
+from bravia_client.client import BraviaClient  # noqa: E402
+from bravia_client.content import ChannelIndex  # noqa: E402
+from bravia_client.simulator import BraviaSimulator, SimulatedTv  # noqa: E402
+
+
+def run(sizes=(1000, 2000, 5000, 10000), latency=0.002):
+    results = []
+    for size in sizes:
+        with BraviaSimulator(tv=SimulatedTv(channels=size), latency=latency) as simulator:
+            client = BraviaClient(simulator.address, simulator.psk)
+            try:
+                index = ChannelIndex(client)
+                start = time.perf_counter()
+                index.refresh()
+                walk = time.perf_counter() - start
+                walk_requests = sum(simulator.requests.values())
+
+                start = time.perf_counter()
+                index.refresh()
+                unchanged = time.perf_counter() - start
+
+                number = '%03d' % (size // 2)
+                start = time.perf_counter()
+                for _ in range(10000):
+                    index.uri_for_number(number)
+                lookup = (time.perf_counter() - start) / 10000
+            finally:
+                client.close()
+        results.append({
+            'channels': size,
+            'indexed': len(index),
+            'walk_ms': walk * 1e3,
+            'walk_requests': walk_requests,
+            'channels_per_second': size / walk,
+            'unchanged_refresh_ms': unchanged * 1e3,
+            'lookup_us': lookup * 1e6
+        })
+    return results
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.002
+    print('%8s %10s %9s %12s %14s %10s' % ('channels', 'walk ms', 'requests', 'channels/s', 'unchanged ms',
+                                          'lookup us'))
+    for r in run(latency=latency):
+        print('%8d %10.1f %9d %12.0f %14.2f %10.3f' % (r['channels'], r['walk_ms'], r['walk_requests'],
+                                                     r['channels_per_second'], r['unchanged_refresh_ms'],
+                                                     r['lookup_us']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Per-call cost of building a request body: a fresh dict passed through
+# json.dumps (the old wrappers) against the pre-encoded RpcMethod envelopes.
+#
+#     python benchmarks/bench_encode.py
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bravia_client import methods  # noqa: E402
+
+
+def dict_get_power_status():
+    data = {
+        "method": "getPowerStatus",
+        "id": 606,
+        "params": [],
+        "version": "1.0"
+    }
+    return json.dumps(data).encode("UTF-8")
+
+
+def dict_get_playing_content_info():
+    data = {
+        "method": "getPlayingContentInfo",
+        "id": 406,
+        "params": [],
+        "version": "1.0"
+    }
+    return json.dumps(data).encode("UTF-8")
+
+
+def dict_set_audio_volume(volume):
+    data = {
+        "method": "setAudioVolume",
+        "id": 305,
+        "params": [{
+            "volume": volume,
+            "ui": "on",
+            "target": "speaker"
+        }],
+        "version": "1.2"
+    }
+    return json.dumps(data).encode("UTF-8")
+
+
+def dict_set_play_content(uri):
+    data = {
+        "method": "setPlayContent",
+        "id": 407,
+        "params": [{"uri": uri}],
+        "version": "1.0"
+    }
+    return json.dumps(data).encode("UTF-8")
+
+
+URI = 'tv:dvbt?trip=9018.1025.10273&srvName=BBC ONE'
+
+CASES = [
+    ('getPowerStatus', dict_get_power_status, (), methods.GET_POWER_STATUS),
+    ('getPlayingContentInfo', dict_get_playing_content_info, (), methods.GET_PLAYING_CONTENT_INFO),
+    ('setAudioVolume', dict_set_audio_volume, ('+2',), methods.SET_AUDIO_VOLUME),
+    ('setPlayContent', dict_set_play_content, (URI,), methods.SET_PLAY_CONTENT),
+]
+
+
+def per_call_ns(func, args, number):
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=5)) / number * 1e9
+
+
+# Sample arguments by parameter name, for timing every registered method.
+SAMPLE_ARGS = {
+    'cnt': 50, 'language': 'en', 'mode': 'Demo', 'scene': 'auto', 'scheme': 'tv',
+    'services': ('system', 'avContent'), 'settings': [{"target": "outputTerminal", "value": "speaker"}],
+    'source': 'tv:dvbt', 'st_idx': 0,
+    'status': True, 'target': '', 'text': 'hello', 'type': '', 'uri': URI, 'volume': '+2'
+}
+
+
+def run_registry(number=20000):
+    results = []
+    for name, method in sorted(methods.registry.items()):
+        args = [SAMPLE_ARGS[arg] for arg in method.arg_names]
+        results.append({
+            'method': name,
+            'service': method.service,
+            'args': len(args),
+            'registry_ns': per_call_ns(method.encode, args, number),
+        })
+    return results
+
+
+def run(number=100000):
+    results = []
+    for name, build, args, method in CASES:
+        assert build(*args) == method.encode(*args), name
+        results.append({
+            'method': name,
+            'dict_ns': per_call_ns(build, args, number),
+            'registry_ns': per_call_ns(method.encode, args, number),
+        })
+    return results
+
+
+def main():
+    print('%-24s %12s %12s %8s' % ('method', 'dict ns', 'registry ns', 'speedup'))
+    for r in run():
+        print('%-24s %12.0f %12.0f %7.1fx' % (r['method'], r['dict_ns'], r['registry_ns'],
+                                              r['dict_ns'] / r['registry_ns']))
+    print()
+    print('%-32s %12s' % ('method', 'registry ns'))
+    for r in run_registry():
+        print('%-32s %12.0f' % (r['method'], r['registry_ns']))
+
+
+if __name__ == '__main__':
+    main()
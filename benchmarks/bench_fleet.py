@@ -0,0 +1,71 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Fan-out throughput of BraviaFleet.broadcast() over many simulated TVs,
+# each answering after `latency` seconds, against calling them one by one.
+#
+#     python benchmarks/bench_fleet.py [latency seconds]
+
+import sys
+import time
+
+import timing  # noqa: F401
+
+from bravia_client import result  # noqa: E402
+from bravia_client.fleet import BraviaFleet  # noqa: E402
+from bravia_client.simulator import BraviaSimulator  # noqa: E402
+
+
+def run(sizes=(1, 8, 32), latency=0.05, max_workers=8, rounds=3):
+    results = []
+    for size in sizes:
+        simulators = [BraviaSimulator(latency=latency).start() for _ in range(size)]
+        fleet = BraviaFleet.from_hosts([s.address for s in simulators], simulators[0].psk, max_workers)
+        try:
+            fleet.broadcast('get_power_status')
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for client in fleet.clients.values():
+                    result(client.get_power_status())
+            sequential = (time.perf_counter() - start) / rounds
+
+            outcomes = [fleet.broadcast('get_power_status') for _ in range(rounds)]
+            wall = sum(o.wall_time for o in outcomes) / rounds
+            errors = sum(len(o.errors) for o in outcomes)
+        finally:
+            fleet.close()
+            for simulator in simulators:
+                simulator.stop()
+        results.append({
+            'tvs': size,
+            'max_workers': max_workers,
+            'sequential_ms': sequential * 1e3,
+            'broadcast_ms': wall * 1e3,
+            'tvs_per_second': size / wall,
+            'speedup': sequential / wall,
+            'errors': errors
+        })
+    return results
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    print('%5s %8s %14s %13s %8s %8s' % ('TVs', 'workers', 'sequential ms', 'broadcast ms', 'TVs/s', 'speedup'))
+    for r in run(latency=latency):
+        print('%5d %8d %14.1f %13.1f %8.0f %7.1fx' % (r['tvs'], r['max_workers'], r['sequential_ms'],
+                                                     r['broadcast_ms'], r['tvs_per_second'], r['speedup']))
+
+
+if __name__ == '__main__':
+    main()
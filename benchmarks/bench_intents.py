@@ -0,0 +1,133 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Time from calling a handle_*_intent method to the simulated TV
+# acknowledging the command it sends. Needs mycroft-core installed; the
+# skill is wired up the way initialize() does it, minus the message bus.
+# Volume changes include the VolumeController coalescing window.
+#
+#     python benchmarks/bench_intents.py [repeat]
+
+import importlib.util
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from timing import summarize
+
+from bravia_client.simulator import BraviaSimulator  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def load_skill():
+    spec = importlib.util.spec_from_file_location('bravia_skill', os.path.join(ROOT, '__init__.py'),
+                                                  submodule_search_locations=[ROOT])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def build_skill(package, simulator):
+    from bravia_skill.bravia_client.apps import AppCatalog
+    from bravia_skill.bravia_client.content import ChannelIndex
+    from bravia_skill.bravia_client.executor import CommandExecutor
+    from bravia_skill.bravia_client.ircc import IrccRemote
+    from bravia_skill.bravia_client.profile import DeviceProfile
+    from bravia_skill.bravia_client.state import StateMirror
+    from bravia_skill.bravia_client.volume import VolumeController
+
+    client = package.bravia_client
+    client.configure(simulator.address, simulator.psk)
+    skill = package.BraviaSkill.__new__(package.BraviaSkill)
+    skill.log = logging.getLogger('bench_intents')
+    skill.heard_at = None
+    skill.rediscovered_at = 0
+    skill.lang = 'en-us'
+    skill.profile = DeviceProfile(tempfile.mkdtemp(), simulator.address, client)
+    skill.speak_dialog = lambda *args, **kwargs: None
+    skill.commands = CommandExecutor()
+    skill.channels = ChannelIndex(client)
+    skill.apps = AppCatalog(client)
+    skill.remote = IrccRemote(client)
+    skill.state = StateMirror(client)
+    skill.volume = VolumeController(client, skill.state, on_error=skill.on_command_failed,
+                                    executor=skill.commands)
+    skill.refresh_channels()
+    skill.refresh_apps()
+    return skill
+
+
+def run(repeat=20, latency=0.005):
+    try:
+        package = load_skill()
+        from mycroft.messagebus.message import Message
+    except ImportError as e:
+        return [{'case': 'skipped', 'reason': str(e)}]
+
+    results = []
+    with BraviaSimulator(latency=latency) as simulator:
+        skill = build_skill(package, simulator)
+        acked = threading.Event()
+
+        def on_done(response=None):
+            acked.set()
+
+        skill.on_command_done = on_done
+        skill.volume._sent = on_done
+        cases = [
+            ('volume_up', skill.handle_volume_up_intent, {}),
+            ('change_channel', skill.handle_change_channel_intent, {'Number': '42'}),
+            ('open_app', skill.handle_open_app_intent, {'App': 'netflix'}),
+            ('power_off', skill.handle_power_off_intent, {}),
+        ]
+        try:
+            for name, handler, data in cases:
+                samples = []
+                handled = []
+                for _ in range(repeat):
+                    acked.clear()
+                    start = time.perf_counter()
+                    handler(Message('bench', data))
+                    handled.append(time.perf_counter() - start)
+                    if not acked.wait(5):
+                        raise TimeoutError('%s was not acknowledged' % name)
+                    samples.append(time.perf_counter() - start)
+                summary = summarize(samples)
+                summary.update(case=name, handler_median_ms=summarize(handled)['median_ms'])
+                results.append(summary)
+        finally:
+            skill.commands.stop()
+            skill.state.stop()
+            package.bravia_client.client.close()
+    return results
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print('%-16s %10s %10s %10s %12s' % ('intent', 'median ms', 'p95 ms', 'max ms', 'handler ms'))
+    for r in run(repeat):
+        if r['case'] == 'skipped':
+            print('skipped: %s' % r['reason'])
+            continue
+        print('%-16s %10.2f %10.2f %10.2f %12.3f' % (r['case'], r['median_ms'], r['p95_ms'], r['max_ms'],
+                                                     r['handler_median_ms']))
+
+
+if __name__ == '__main__':
+    main()
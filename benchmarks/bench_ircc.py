@@ -0,0 +1,85 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# IRCC key throughput against a local stand-in for the TV's SOAP endpoint.
+#
+#     python benchmarks/bench_ircc.py [keys]
+
+import http.server
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import bravia_client  # noqa: E402
+from bravia_client.ircc import IrccRemote  # noqa: E402
+
+CODES = {'Num%d' % i: 'AAAAAQAAAAEAAAA%sAw==' % i for i in range(10)}
+CODES['Confirm'] = 'AAAAAQAAAAEAAABlAw=='
+
+
+class IrccHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    keys = 0
+    connections = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        IrccHandler.keys += 1
+        IrccHandler.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def run(keys=500, spacings=(0.0, 0.01)):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), IrccHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    bravia_client.configure('127.0.0.1:%d' % server.server_port, 'bench')
+    results = []
+    try:
+        for spacing in spacings:
+            remote = IrccRemote(bravia_client, CODES, spacing)
+            sequence = [str(i % 10) for i in range(keys - 1)] + ['Confirm']
+            IrccHandler.keys = 0
+            IrccHandler.connections.clear()
+            start = time.perf_counter()
+            remote.send_sequence(sequence)
+            elapsed = time.perf_counter() - start
+            results.append({
+                'spacing': spacing,
+                'keys': IrccHandler.keys,
+                'connections': len(IrccHandler.connections),
+                'keys_per_second': IrccHandler.keys / elapsed
+            })
+    finally:
+        bravia_client.connection.close()
+        server.shutdown()
+    return results
+
+
+def main():
+    keys = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print('%8s %6s %12s %10s' % ('spacing', 'keys', 'connections', 'keys/s'))
+    for r in run(keys):
+        print('%8.3f %6d %12d %10.0f' % (r['spacing'], r['keys'], r['connections'], r['keys_per_second']))
+
+
+if __name__ == '__main__':
+    main()
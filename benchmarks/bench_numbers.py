@@ -0,0 +1,146 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Channel numbers out of "change to channel ..." utterances, en-us and es-es:
+# the old Number.rx (first word after "channel", digits only) against the
+# new one followed by parse_number(). Reports how many of a generated corpus
+# each gets right and the time per utterance.
+#
+#     python benchmarks/bench_numbers.py [utterances per language]
+
+import os
+import random
+import re
+import sys
+import time
+
+import timing  # noqa: F401
+
+from bravia_client.numbers import parse_number  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+OLD_REGEX = {
+    'en-us': r'.* channel (?P<Number>\S*).*',
+    'es-es': r'.* canal (?P<Number>\S*).*'
+}
+
+EN_UNITS = 'zero one two three four five six seven eight nine'.split()
+EN_TEENS = 'ten eleven twelve thirteen fourteen fifteen sixteen seventeen eighteen nineteen'.split()
+EN_TENS = ' ten twenty thirty forty fifty sixty seventy eighty ninety'.split(' ')
+ES_UNITS = 'cero uno dos tres cuatro cinco seis siete ocho nueve'.split()
+ES_LOW = ('diez once doce trece catorce quince dieciséis diecisiete dieciocho diecinueve veinte veintiuno '
+          'veintidós veintitrés veinticuatro veinticinco veintiséis veintisiete veintiocho veintinueve').split()
+ES_TENS = ' diez veinte treinta cuarenta cincuenta sesenta setenta ochenta noventa'.split(' ')
+ES_HUNDREDS = (' ciento doscientos trescientos cuatrocientos quinientos seiscientos setecientos ochocientos '
+               'novecientos').split(' ')
+
+
+def en_words(n):
+    if n < 10:
+        return EN_UNITS[n]
+    if n < 20:
+        return EN_TEENS[n - 10]
+    if n < 100:
+        return EN_TENS[n // 10] + ('' if n % 10 == 0 else ' ' + EN_UNITS[n % 10])
+    return EN_UNITS[n // 100] + ' hundred' + ('' if n % 100 == 0 else ' and ' + en_words(n % 100))
+
+
+def es_words(n):
+    if n < 10:
+        return ES_UNITS[n]
+    if n < 30:
+        return ES_LOW[n - 10]
+    if n < 100:
+        return ES_TENS[n // 10] + ('' if n % 10 == 0 else ' y ' + ES_UNITS[n % 10])
+    if n == 100:
+        return 'cien'
+    return ES_HUNDREDS[n // 100] + ('' if n % 100 == 0 else ' ' + es_words(n % 100))
+
+
+def spoken(n, lang, rng):
+    """One of the ways `n` might come out of the speech to text."""
+    words = en_words if lang == 'en-us' else es_words
+    style = rng.randrange(4)
+    if style == 0:
+        return str(n)
+    if style == 1 or n < 10:
+        return words(n)
+    if style == 2:
+        # Digit by digit: "one oh four", "uno cero cuatro".
+        zero = 'oh' if lang == 'en-us' else 'cero'
+        return ' '.join(zero if d == '0' else words(int(d)) for d in str(n))
+    if n >= 100 and n % 100 >= 10:
+        # Hundreds then the rest: "one twenty three".
+        return words(n // 100) + ' ' + words(n % 100)
+    return '-'.join(str(n))
+
+
+def corpus(size, lang, seed=0):
+    rng = random.Random(seed)
+    if lang == 'en-us':
+        before, after = ['change to channel', 'put on channel', 'switch to channel'], ['', ' please', ' now']
+    else:
+        before, after = ['cambia al canal', 'pon el canal', 'pon canal'], ['', ' por favor', ' ahora']
+    utterances = []
+    for _ in range(size):
+        n = rng.randrange(1, 1000)
+        utterances.append((rng.choice(before) + ' ' + spoken(n, lang, rng) + rng.choice(after), n))
+    return utterances
+
+
+def _old(regex, utterance, lang):
+    match = regex.match(utterance)
+    number = match.group('Number') if match else None
+    return int(number) if number and number.isdigit() else None
+
+
+def _new(regex, utterance, lang):
+    match = regex.match(utterance)
+    return parse_number(match.group('Number'), lang) if match else None
+
+
+def run(size=20000):
+    results = []
+    for lang in ('en-us', 'es-es'):
+        utterances = corpus(size, lang)
+        with open(os.path.join(ROOT, 'regex', lang, 'Number.rx')) as f:
+            new_regex = re.compile(f.read().strip())
+        for name, regex, extract in (('old regex', re.compile(OLD_REGEX[lang]), _old),
+                                     ('regex + parser', new_regex, _new)):
+            start = time.perf_counter()
+            found = [extract(regex, utterance, lang) for utterance, _ in utterances]
+            elapsed = time.perf_counter() - start
+            correct = sum(1 for got, (_, want) in zip(found, utterances) if got == want)
+            results.append({
+                'lang': lang,
+                'extractor': name,
+                'utterances': size,
+                'correct': correct,
+                'accuracy': correct / size,
+                'us_per_utterance': elapsed / size * 1e6
+            })
+    return results
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print('%6s %15s %9s %10s %8s' % ('lang', 'extractor', 'correct', 'accuracy', 'us'))
+    for r in run(size):
+        print('%6s %15s %9d %9.1f%% %8.2f' % (r['lang'], r['extractor'], r['correct'], r['accuracy'] * 100,
+                                              r['us_per_utterance']))
+
+
+if __name__ == '__main__':
+    main()
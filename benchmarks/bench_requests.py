@@ -0,0 +1,62 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# post_request round trips against the simulated TV, on a new connection
+# each time (cold) and on the pooled keep-alive connection (warm).
+#
+#     python benchmarks/bench_requests.py [requests]
+
+import sys
+
+from timing import measure, summarize
+
+from bravia_client.client import BraviaClient  # noqa: E402
+from bravia_client.simulator import BraviaSimulator  # noqa: E402
+
+
+def run(requests=200, latency=0.0):
+    results = []
+    with BraviaSimulator(latency=latency) as simulator:
+        client = BraviaClient(simulator.address, simulator.psk)
+        data = {"method": "getPowerStatus", "id": 606, "params": [], "version": "1.0"}
+
+        def cold():
+            client.connection.close()
+            client.post_request('system', data)
+
+        def warm():
+            client.post_request('system', data)
+
+        try:
+            warm()
+            for name, func in (('cold', cold), ('warm', warm)):
+                connections = simulator.connections
+                summary = summarize(measure(func, requests))
+                summary.update(case=name, connections=simulator.connections - connections)
+                results.append(summary)
+        finally:
+            client.close()
+    return results
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print('%-6s %8s %10s %10s %10s %12s' % ('case', 'count', 'median ms', 'p95 ms', 'max ms', 'connections'))
+    for r in run(requests):
+        print('%-6s %8d %10.3f %10.3f %10.3f %12d' % (r['case'], r['count'], r['median_ms'], r['p95_ms'],
+                                                      r['max_ms'], r['connections']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Startup cost in fresh interpreters: importing bravia_client and the
+# modules the skill loads, then the first and second call to a simulated TV
+# (the first one loads the HTTP stack and opens the connection).
+#
+#     python benchmarks/bench_startup.py [runs]
+
+import json
+import os
+import subprocess
+import sys
+
+from timing import summarize
+
+from bravia_client.simulator import BraviaSimulator  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Runs in the child interpreter. The simulator stays in this process so its
+# own imports do not warm up the child.
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import bravia_client
+from bravia_client import apps, content, discovery, executor, fleet, ircc, power, profile, state, volume
+imported = time.perf_counter()
+http_loaded = 'requests' in sys.modules
+bravia_client.configure(sys.argv[1], sys.argv[2])
+configured = time.perf_counter()
+bravia_client.result(bravia_client.get_power_status())
+first = time.perf_counter()
+bravia_client.result(bravia_client.get_power_status())
+second = time.perf_counter()
+print(json.dumps({"import": imported - start, "configure": configured - imported, "first_call": first - configured,
+                  "second_call": second - first, "http_loaded_at_import": http_loaded}))
+'''
+
+
+def run(runs=10):
+    samples = {'import': [], 'configure': [], 'first_call': [], 'second_call': []}
+    http_loaded = False
+    with BraviaSimulator() as simulator:
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, '-c', CHILD, simulator.address, simulator.psk], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout
+            sample = json.loads(output)
+            http_loaded = http_loaded or sample.pop('http_loaded_at_import')
+            for name, seconds in sample.items():
+                samples[name].append(seconds)
+    results = []
+    for name, values in samples.items():
+        summary = summarize(values)
+        summary.update(phase=name, http_loaded_at_import=http_loaded)
+        results.append(summary)
+    return results
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    results = run(runs)
+    print('%-12s %10s %10s %10s' % ('phase', 'median ms', 'min ms', 'max ms'))
+    for r in results:
+        print('%-12s %10.2f %10.2f %10.2f' % (r['phase'], r['median_ms'], r['min_ms'], r['max_ms']))
+    print('HTTP stack loaded at import: %s' % ('yes' if results[0]['http_loaded_at_import'] else 'no'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Runs every benchmark against local simulated TVs and writes the results
+# as one JSON document, for comparing runs across commits.
+#
+#     python benchmarks/run_all.py [-o results.json] [only ...]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import timing  # noqa: F401
+
+import bench_content  # noqa: E402
+import bench_encode  # noqa: E402
+import bench_fleet  # noqa: E402
+import bench_intents  # noqa: E402
+import bench_ircc  # noqa: E402
+import bench_numbers  # noqa: E402
+import bench_requests  # noqa: E402
+import bench_startup  # noqa: E402
+
+BENCHMARKS = [
+    ('startup', bench_startup.run),
+    ('encode', bench_encode.run),
+    ('encode_registry', bench_encode.run_registry),
+    ('requests', bench_requests.run),
+    ('intents', bench_intents.run),
+    ('content', bench_content.run),
+    ('fleet', bench_fleet.run),
+    ('ircc', bench_ircc.run),
+    ('numbers', bench_numbers.run),
+]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(only=()):
+    report = {
+        'meta': {
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'benchmarks': {}
+    }
+    for name, func in BENCHMARKS:
+        if only and name not in only:
+            continue
+        start = time.perf_counter()
+        results = func()
+        report['benchmarks'][name] = {'seconds': time.perf_counter() - start, 'results': results}
+        print('%-16s done in %.1fs' % (name, time.perf_counter() - start), file=sys.stderr)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Bravia benchmarks')
+    parser.add_argument('-o', '--output', help='write JSON here instead of stdout')
+    parser.add_argument('only', nargs='*', help='benchmarks to run (default: all): %s'
+                        % ', '.join(name for name, _ in BENCHMARKS))
+    args = parser.parse_args()
+    unknown = set(args.only) - {name for name, _ in BENCHMARKS}
+    if unknown:
+        parser.error('unknown benchmark: %s' % ', '.join(sorted(unknown)))
+    report = run(args.only)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Helpers shared by the benchmarks.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def summarize(samples):
+    """min/median/p95/max/mean in milliseconds of durations in seconds."""
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        'count': count,
+        'min_ms': ordered[0] * 1e3,
+        'median_ms': ordered[count // 2] * 1e3,
+        'p95_ms': ordered[min(count - 1, int(count * 0.95))] * 1e3,
+        'max_ms': ordered[-1] * 1e3,
+        'mean_ms': sum(ordered) / count * 1e3
+    }
+
+
+def measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
@@ -0,0 +1,269 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from . import methods
+from .client import BraviaClient
+from .connection import BraviaConnection
+from .errors import BraviaError, RpcError
+from .metrics import Metrics
+
+# Request metrics for every TV, kept across configure().
+metrics = Metrics()
+
+# The TV the module-level functions talk to. configure() replaces it, so look
+# these up through the module rather than importing them by name. Until
+# then every request fails locally with NotConfiguredError.
+client = BraviaClient(None, None, metrics=metrics)
+connection = client.connection
+cache = client.cache
+
+
+def configure(tv_host, psk, pool_size=2, idle_timeout=15, latency_budget=None):
+    global client, connection, cache
+    client.close()
+    client = BraviaClient(tv_host, psk, pool_size, idle_timeout, metrics=metrics, latency_budget=latency_budget)
+    connection = client.connection
+    cache = client.cache
+
+
+# COMMON METHODS
+
+
+def post_request(service, data):
+    return client.post_request(service, data)
+
+
+def result(response):
+    try:
+        payload = response.json()
+    except ValueError:
+        raise BraviaError('HTTP %d: not a JSON-RPC response' % response.status_code)
+    if "error" in payload:
+        raise RpcError(*payload["error"][:2])
+    return payload.get("result", [])
+
+
+def call(method, *args):
+    return client.call(method, *args)
+
+
+# GUIDE SERVICE
+
+
+def get_supported_api_info(services=None):
+    return client.get_supported_api_info(services)
+
+
+# APP CONTROL SERVICE
+
+
+def get_application_list():
+    return client.get_application_list()
+
+
+def get_application_status_list():
+    return client.get_application_status_list()
+
+
+def get_text_form():
+    return client.get_text_form()
+
+
+def get_web_app_status():
+    return client.get_web_app_status()
+
+
+def set_active_app(uri):
+    return client.set_active_app(uri)
+
+
+def set_text_form(text):
+    return client.set_text_form(text)
+
+
+def terminate_apps():
+    return client.terminate_apps()
+
+
+# AUDIO SERVICE
+
+
+def get_sound_settings():
+    return client.get_sound_settings()
+
+
+def get_speaker_settings():
+    return client.get_speaker_settings()
+
+
+def get_volume_information():
+    return client.get_volume_information()
+
+
+def set_audio_mute(status):
+    return client.set_audio_mute(status)
+
+
+def mute():
+    return client.mute()
+
+
+def unmute():
+    return client.unmute()
+
+
+def set_audio_volume(volume):
+    return client.set_audio_volume(volume)
+
+
+def volume_raise():
+    set_audio_volume('+2')
+
+
+def volume_lower():
+    set_audio_volume('-2')
+
+
+def set_sound_settings(settings):
+    return client.set_sound_settings(settings)
+
+
+def set_speaker_settings(settings):
+    return client.set_speaker_settings(settings)
+
+
+# AV CONTENT SERVICE
+
+
+def get_content_count(source, type, target):
+    return client.get_content_count(source, type, target)
+
+
+def get_content_list(uri, st_idx, cnt):
+    return client.get_content_list(uri, st_idx, cnt)
+
+
+def get_current_external_inputs_status():
+    return client.get_current_external_inputs_status()
+
+
+def get_scheme_list():
+    return client.get_scheme_list()
+
+
+def get_source_list(scheme):
+    return client.get_source_list(scheme)
+
+
+def get_playing_content_info():
+    return client.get_playing_content_info()
+
+
+def set_play_content(uri):
+    return client.set_play_content(uri)
+
+
+# ENCRYPTION SERVICE
+
+
+def get_public_key():
+    return client.get_public_key()
+
+
+# SYSTEM SERVICE
+
+
+def get_current_time():
+    return client.get_current_time()
+
+
+def get_interface_information():
+    return client.get_interface_information()
+
+
+def get_led_indicator_status():
+    return client.get_led_indicator_status()
+
+
+def get_network_settings():
+    return client.get_network_settings()
+
+
+def get_power_saving_mode():
+    return client.get_power_saving_mode()
+
+
+def get_power_status():
+    return client.get_power_status()
+
+
+def get_remote_controller_info():
+    return client.get_remote_controller_info()
+
+
+def get_remote_device_settings():
+    return client.get_remote_device_settings()
+
+
+def get_system_information():
+    return client.get_system_information()
+
+
+def get_system_supported_function():
+    return client.get_system_supported_function()
+
+
+def get_wol_mode():
+    return client.get_wol_mode()
+
+
+def request_reboot():
+    return client.request_reboot()
+
+
+def set_led_indicator_status(mode, status):
+    return client.set_led_indicator_status(mode, status)
+
+
+def set_language(language):
+    return client.set_language(language)
+
+
+def set_power_saving_mode(mode):
+    return client.set_power_saving_mode(mode)
+
+
+def set_power_status(status):
+    return client.set_power_status(status)
+
+
+def power_on():
+    return client.power_on()
+
+
+def power_off():
+    return client.power_off()
+
+
+def set_wol_mode(mode):
+    return client.set_wol_mode(mode)
+
+
+# VIDEO SCREEN SERVICE
+
+
+def set_scene_setting(scene):
+    return client.set_scene_setting(scene)
+
@@ -0,0 +1,54 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Call one method on a TV and print the reply, e.g.
+
+    python -m bravia_client 192.168.1.20 0000 getVolumeInformation
+    python -m bravia_client 192.168.1.20 0000 setAudioVolume '"+2"'
+"""
+
+import argparse
+import json
+import sys
+
+from . import methods
+from .client import BraviaClient
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bravia_client', description='Call a Sony Bravia TV method')
+    parser.add_argument('host', help='address of the TV, with an optional :port')
+    parser.add_argument('psk', help='pre-shared key set on the TV')
+    parser.add_argument('method', nargs='?', default='getPowerStatus')
+    parser.add_argument('args', nargs='*', help='arguments as JSON values')
+    args = parser.parse_args()
+    method = methods.registry.get(args.method)
+    if method is None:
+        parser.error('unknown method %s (known: %s)' % (args.method, ', '.join(sorted(methods.registry))))
+    try:
+        values = [json.loads(value) for value in args.args]
+    except ValueError as e:
+        parser.error('arguments must be JSON values: %s' % e)
+    client = BraviaClient(args.host, args.psk)
+    try:
+        response = client.call(method, *values)
+    except (OSError, TypeError) as e:
+        sys.exit('%s: %s' % (args.method, e))
+    finally:
+        client.close()
+    print(json.dumps(response.json(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
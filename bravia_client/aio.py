@@ -0,0 +1,416 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import itertools
+import json
+import time
+
+from . import methods, result
+from .cache import ResponseCache
+from .capabilities import Capabilities, parse_api_info
+from .errors import ResponseMismatchError
+from .health import PROBE, CircuitBreaker, split_budget
+from .metrics import Metrics
+from .tracing import tracer
+
+
+class _StaleConnection(Exception):
+    """A pooled socket the TV had closed. `sent` is True when the request
+    was written before that showed, so the TV may have acted on it."""
+
+    def __init__(self, sent):
+        super(_StaleConnection, self).__init__()
+        self.sent = sent
+
+
+class AsyncResponse(object):
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self._json = None
+
+    @property
+    def text(self):
+        return self.content.decode("UTF-8")
+
+    def json(self):
+        if self._json is None:
+            self._json = json.loads(self.content)
+        return self._json
+
+
+class _Connection(object):
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncBraviaClient(object):
+    """asyncio version of the bravia_client service functions.
+
+    Requests are written over a small pool of keep-alive sockets, so
+    concurrent calls run in parallel up to `pool_size`. Every call gets its
+    own JSON-RPC id, and the id echoed by the TV is checked against it.
+    Timeouts and the circuit breaker work as in BraviaConnection.
+    """
+
+    def __init__(self, host, psk, pool_size=2, idle_timeout=15, cache=None, metrics=None, connect_timeout=2.0,
+                 read_timeout=5.0, latency_budget=None, breaker=None):
+        self.host = host
+        self.psk = psk
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        address, _, port = host.partition(':')
+        self._address = address
+        self._port = int(port or 80)
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._ids = itertools.count(1)
+        self.cache = ResponseCache() if cache is None else cache
+        self.metrics = Metrics() if metrics is None else metrics
+        self.capabilities = None
+        self.timeout = split_budget(latency_budget, connect_timeout, read_timeout)
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # CONNECTION
+
+    async def _acquire(self):
+        await self._slots.acquire()
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if now - conn.last_used <= self.idle_timeout and not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self._address, self._port),
+                                                    self.timeout[0])
+        except asyncio.TimeoutError:
+            self._slots.release()
+            raise TimeoutError('Connecting to %s timed out' % self.host)
+        except BaseException:
+            self._slots.release()
+            raise
+        return _Connection(reader, writer), False
+
+    def _release(self, conn, keep_alive):
+        if keep_alive:
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def _exchange(self, conn, service, body):
+        head = ('POST /sony/%s HTTP/1.1\r\n'
+                'Host: %s\r\n'
+                'X-Auth-PSK: %s\r\n'
+                'Content-Type: application/json; charset=UTF-8\r\n'
+                'Content-Length: %d\r\n'
+                'Connection: keep-alive\r\n'
+                '\r\n') % (service, self.host, self.psk, len(body))
+        try:
+            conn.writer.write(head.encode('latin-1') + body)
+            await conn.writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            raise _StaleConnection(sent=False)
+        try:
+            status_line = await conn.reader.readline()
+        except ConnectionResetError:
+            raise _StaleConnection(sent=True)
+        if not status_line:
+            raise _StaleConnection(sent=True)
+
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            content = await self._read_chunked(conn.reader)
+        elif 'content-length' in headers:
+            content = await conn.reader.readexactly(int(headers['content-length']))
+        else:
+            content = await conn.reader.read()
+            keep_alive = False
+
+        return AsyncResponse(int(status), headers, content), keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader):
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';', 1)[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def post(self, service, body, method=None):
+        if self.breaker.allow() == PROBE:
+            await self.probe()
+        return await self._send(service, body, method)
+
+    async def probe(self):
+        """getPowerStatus, sent even while the circuit is open. Closes it if
+        the TV answers."""
+        return await self._send('system', methods.GET_POWER_STATUS.payload, methods.GET_POWER_STATUS.name)
+
+    async def _send(self, service, body, method):
+        stats = self.metrics.begin(self.host, service, method or service, len(body))
+        start = time.perf_counter()
+        response = None
+        with tracer.span(method or service, 'rpc', service=service, host=self.host):
+            try:
+                while True:
+                    conn, reused = await self._acquire()
+                    keep_alive = False
+                    try:
+                        response, keep_alive = await asyncio.wait_for(self._exchange(conn, service, body),
+                                                                      self.timeout[1])
+                        self.breaker.succeeded()
+                        return response
+                    except _StaleConnection as e:
+                        # The TV closed a pooled socket. Send again only if the
+                        # write failed, or the TV may have applied the request
+                        # already and a getter is safe to repeat; a setter such
+                        # as setAudioVolume("+2") is not.
+                        if not reused or (e.sent and not (method or '').startswith('get')):
+                            raise ConnectionResetError('Connection closed by %s' % self.host)
+                    except asyncio.TimeoutError:
+                        raise TimeoutError('No answer from %s within %ss' % (self.host, self.timeout[1]))
+                    finally:
+                        self._release(conn, keep_alive)
+            except OSError as e:
+                self.breaker.failed(e)
+                raise
+            finally:
+                self.metrics.end(stats, time.perf_counter() - start, response)
+
+    async def negotiate(self):
+        """Ask the TV which methods and versions it supports."""
+        response = await self.get_supported_api_info(methods.SERVICES)
+        self.capabilities = Capabilities(parse_api_info(result(response)[0]))
+        return self.capabilities
+
+    async def call(self, method, *args):
+        if self.capabilities is not None:
+            method = self.capabilities.resolve(method)
+        if self.cache.cacheable(method):
+            response = self.cache.lookup(method, args)
+            if response is None:
+                response = await self._call(method, args)
+                self.cache.store(method, args, response)
+            return response
+        try:
+            return await self._call(method, args)
+        finally:
+            self.cache.invalidate_after(method)
+
+    async def _call(self, method, args):
+        request_id = next(self._ids)
+        response = await self.post(method.service, method.encode(*args, request_id=request_id), method.name)
+        try:
+            reply_id = response.json().get("id")
+        except ValueError:
+            return response
+        if reply_id is not None and reply_id != request_id:
+            raise ResponseMismatchError('%s: sent id %s, got %s' % (method.name, request_id, reply_id))
+        return response
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+        for conn in idle:
+            try:
+                await conn.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    # GUIDE SERVICE
+
+    async def get_supported_api_info(self, services=None):
+        return await self.call(methods.GET_SUPPORTED_API_INFO, tuple(services or methods.SERVICES))
+
+    # APP CONTROL SERVICE
+
+    async def get_application_list(self):
+        return await self.call(methods.GET_APPLICATION_LIST)
+
+    async def get_application_status_list(self):
+        return await self.call(methods.GET_APPLICATION_STATUS_LIST)
+
+    async def get_text_form(self):
+        return await self.call(methods.GET_TEXT_FORM)
+
+    async def get_web_app_status(self):
+        return await self.call(methods.GET_WEB_APP_STATUS)
+
+    async def set_active_app(self, uri):
+        return await self.call(methods.SET_ACTIVE_APP, uri)
+
+    async def set_text_form(self, text):
+        return await self.call(methods.SET_TEXT_FORM, text)
+
+    async def terminate_apps(self):
+        return await self.call(methods.TERMINATE_APPS)
+
+    # AUDIO SERVICE
+
+    async def get_sound_settings(self):
+        return await self.call(methods.GET_SOUND_SETTINGS)
+
+    async def get_speaker_settings(self):
+        return await self.call(methods.GET_SPEAKER_SETTINGS)
+
+    async def get_volume_information(self):
+        return await self.call(methods.GET_VOLUME_INFORMATION)
+
+    async def set_audio_mute(self, status):
+        return await self.call(methods.SET_AUDIO_MUTE, status)
+
+    async def mute(self):
+        return await self.set_audio_mute(True)
+
+    async def unmute(self):
+        return await self.set_audio_mute(False)
+
+    async def set_audio_volume(self, volume):
+        return await self.call(methods.SET_AUDIO_VOLUME, volume)
+
+    async def volume_raise(self):
+        return await self.set_audio_volume('+2')
+
+    async def volume_lower(self):
+        return await self.set_audio_volume('-2')
+
+    async def set_sound_settings(self, settings):
+        return await self.call(methods.SET_SOUND_SETTINGS, settings)
+
+    async def set_speaker_settings(self, settings):
+        return await self.call(methods.SET_SPEAKER_SETTINGS, settings)
+
+    # AV CONTENT SERVICE
+
+    async def get_content_count(self, source, type, target):
+        return await self.call(methods.GET_CONTENT_COUNT, source, type, target)
+
+    async def get_content_list(self, uri, st_idx, cnt):
+        return await self.call(methods.GET_CONTENT_LIST, uri, st_idx, cnt)
+
+    async def get_current_external_inputs_status(self):
+        return await self.call(methods.GET_CURRENT_EXTERNAL_INPUTS_STATUS)
+
+    async def get_scheme_list(self):
+        return await self.call(methods.GET_SCHEME_LIST)
+
+    async def get_source_list(self, scheme):
+        return await self.call(methods.GET_SOURCE_LIST, scheme)
+
+    async def get_playing_content_info(self):
+        return await self.call(methods.GET_PLAYING_CONTENT_INFO)
+
+    async def set_play_content(self, uri):
+        return await self.call(methods.SET_PLAY_CONTENT, uri)
+
+    # ENCRYPTION SERVICE
+
+    async def get_public_key(self):
+        return await self.call(methods.GET_PUBLIC_KEY)
+
+    # SYSTEM SERVICE
+
+    async def get_current_time(self):
+        return await self.call(methods.GET_CURRENT_TIME)
+
+    async def get_interface_information(self):
+        return await self.call(methods.GET_INTERFACE_INFORMATION)
+
+    async def get_led_indicator_status(self):
+        return await self.call(methods.GET_LED_INDICATOR_STATUS)
+
+    async def get_network_settings(self):
+        return await self.call(methods.GET_NETWORK_SETTINGS)
+
+    async def get_power_saving_mode(self):
+        return await self.call(methods.GET_POWER_SAVING_MODE)
+
+    async def get_power_status(self):
+        return await self.call(methods.GET_POWER_STATUS)
+
+    async def get_remote_controller_info(self):
+        return await self.call(methods.GET_REMOTE_CONTROLLER_INFO)
+
+    async def get_remote_device_settings(self):
+        return await self.call(methods.GET_REMOTE_DEVICE_SETTINGS)
+
+    async def get_system_information(self):
+        return await self.call(methods.GET_SYSTEM_INFORMATION)
+
+    async def get_system_supported_function(self):
+        return await self.call(methods.GET_SYSTEM_SUPPORTED_FUNCTION)
+
+    async def get_wol_mode(self):
+        return await self.call(methods.GET_WOL_MODE)
+
+    async def request_reboot(self):
+        return await self.call(methods.REQUEST_REBOOT)
+
+    async def set_led_indicator_status(self, mode, status):
+        return await self.call(methods.SET_LED_INDICATOR_STATUS, mode, status)
+
+    async def set_language(self, language):
+        return await self.call(methods.SET_LANGUAGE, language)
+
+    async def set_power_saving_mode(self, mode):
+        return await self.call(methods.SET_POWER_SAVING_MODE, mode)
+
+    async def set_power_status(self, status):
+        return await self.call(methods.SET_POWER_STATUS, status)
+
+    async def power_on(self):
+        return await self.set_power_status(True)
+
+    async def power_off(self):
+        return await self.set_power_status(False)
+
+    async def set_wol_mode(self, mode):
+        return await self.call(methods.SET_WOL_MODE, mode)
+
+    # VIDEO SCREEN SERVICE
+
+    async def set_scene_setting(self, scene):
+        return await self.call(methods.SET_SCENE_SETTING, scene)
@@ -0,0 +1,109 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import difflib
+import re
+import threading
+import time
+
+from . import result
+from .content import normalize_name
+
+_SOUNDEX = str.maketrans('bfpvcgjkqsxzdtlmnr', '111122222222334556', 'aeiouyhw')
+
+
+def tokens(name):
+    return re.findall(r'[0-9a-z]+', name.lower())
+
+
+def phonetic(token):
+    """Soundex key of a token, so "netflicks" finds "Netflix"."""
+    if token.isdigit():
+        return token
+    digits = token[1:].translate(_SOUNDEX)
+    key = [token[0]]
+    for digit in digits:
+        if digit != key[-1]:
+            key.append(digit)
+    return (''.join(key) + '000')[:4]
+
+
+class AppCatalog(object):
+    """Installed applications with a prebuilt index over their titles.
+
+    Lookups try, in order, the title with spaces and punctuation removed
+    ("you tube" -> "YouTube"), the words and Soundex keys shared with a
+    title, and a close string match.
+    """
+
+    def __init__(self, client, max_age=3600):
+        self.client = client
+        self.max_age = max_age
+        self.apps = []
+        self.by_key = {}
+        self.by_token = {}
+        self.refreshed_at = 0
+        self._status = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.apps)
+
+    def refresh(self):
+        apps = result(self.client.get_application_list())[0]
+        by_key = {}
+        by_token = {}
+        for i, app in enumerate(apps):
+            by_key.setdefault(normalize_name(app["title"]), i)
+            for token in tokens(app["title"]):
+                by_token.setdefault(token, set()).add(i)
+                by_token.setdefault('#' + phonetic(token), set()).add(i)
+        with self._lock:
+            self.apps, self.by_key, self.by_token = apps, by_key, by_token
+            self.refreshed_at = time.monotonic()
+
+    def refresh_if_changed(self):
+        """Reload the list if the TV's application status changed or the
+        catalog is older than `max_age`. Returns True when it reloaded.
+        """
+        status = result(self.client.get_application_status_list())
+        if status == self._status and self.apps and time.monotonic() - self.refreshed_at < self.max_age:
+            return False
+        self.refresh()
+        self._status = status
+        return True
+
+    def resolve(self, name):
+        with self._lock:
+            apps, by_key, by_token = self.apps, self.by_key, self.by_token
+        if not apps:
+            return None
+
+        i = by_key.get(normalize_name(name))
+        if i is not None:
+            return apps[i]
+
+        scores = {}
+        for token in tokens(name):
+            for i in by_token.get(token, ()):
+                scores[i] = scores.get(i, 0) + 2
+            for i in by_token.get('#' + phonetic(token), ()):
+                scores[i] = scores.get(i, 0) + 1
+        if scores:
+            return apps[max(scores, key=lambda i: (scores[i], -len(apps[i]["title"])))]
+
+        matches = difflib.get_close_matches(normalize_name(name), list(by_key), 1, 0.6)
+        if matches:
+            return apps[by_key[matches[0]]]
+        return None
@@ -0,0 +1,119 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a successful response stays valid, per JSON-RPC method. Methods
+# not listed here are never cached.
+DEFAULT_TTLS = {
+    "getSystemInformation": 3600,
+    "getInterfaceInformation": 3600,
+    "getRemoteControllerInfo": 3600,
+    "getSystemSupportedFunction": 3600,
+    "getSupportedApiInfo": 3600,
+    "getNetworkSettings": 600,
+    "getWolMode": 300,
+    "getLEDIndicatorStatus": 300,
+    "getPowerSavingMode": 300,
+}
+
+# Cached getters that each setter makes stale.
+INVALIDATES = {
+    "setLEDIndicatorStatus": ["getLEDIndicatorStatus"],
+    "setWolMode": ["getWolMode"],
+    "setPowerSavingMode": ["getPowerSavingMode"],
+    "setLanguage": ["getSystemInformation"],
+    "requestReboot": list(DEFAULT_TTLS),
+}
+
+
+def _succeeded(response):
+    if response.status_code != 200:
+        return False
+    try:
+        return "error" not in response.json()
+    except ValueError:
+        return False
+
+
+class ResponseCache(object):
+    """Read-through cache of responses from rarely changing getters.
+
+    Entries are keyed by method name and arguments, expire after the method's
+    TTL and are evicted least recently used first once `max_entries` is
+    reached.
+    """
+
+    def __init__(self, ttls=None, max_entries=64):
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cacheable(self, method):
+        return method.name in self.ttls
+
+    def lookup(self, method, args):
+        key = (method.name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            # Expired entries stay until replaced or evicted, for last().
+            self.misses += 1
+            return None
+
+    def last(self, method, args=()):
+        """The newest stored response, however old, or None. For decisions
+        that cannot wait for the TV, e.g. whether to send Wake-on-LAN."""
+        with self._lock:
+            entry = self._entries.get((method.name, args))
+            return entry[1] if entry is not None else None
+
+    def store(self, method, args, response):
+        if not _succeeded(response):
+            return
+        key = (method.name, args)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttls[method.name], response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, name):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+
+    def invalidate_after(self, method):
+        for name in INVALIDATES.get(method.name, ()):
+            self.invalidate(name)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries)
+            }
@@ -0,0 +1,75 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from . import methods, result
+from .errors import UnsupportedMethodError
+
+
+def version_key(version):
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split('.'))
+
+
+def parse_api_info(services):
+    """{service: {method: [versions]}} from a getSupportedApiInfo result."""
+    return {
+        service['service']: {
+            api['name']: [v['version'] for v in api.get('versions', [])] for api in service.get('apis', [])
+        } for service in services
+    }
+
+
+class Capabilities(object):
+    """The methods and versions one TV supports, from getSupportedApiInfo.
+
+    resolve() picks the version to send for a registered method among those
+    the TV lists and the method has params for: its own version, else the
+    newest older one, else the oldest newer one. When there is none it
+    raises UnsupportedMethodError without a request being made.
+    """
+
+    def __init__(self, apis):
+        self.apis = apis
+        self._resolved = {}
+
+    @classmethod
+    def probe(cls, client):
+        return cls(parse_api_info(result(client.get_supported_api_info(methods.SERVICES))[0]))
+
+    def versions(self, service, name):
+        return self.apis.get(service, {}).get(name, [])
+
+    def supports(self, service, name):
+        return bool(self.versions(service, name))
+
+    def _best(self, method):
+        versions = [v for v in self.versions(method.service, method.name) if v in method.templates]
+        if not versions:
+            return None
+        if method.version in versions:
+            return method
+        wanted = version_key(method.version)
+        ordered = sorted(versions, key=version_key)
+        older = [v for v in ordered if version_key(v) < wanted]
+        return method.with_version(older[-1] if older else ordered[0])
+
+    def resolve(self, method):
+        if method is methods.GET_SUPPORTED_API_INFO:
+            return method
+        try:
+            resolved = self._resolved[method.name]
+        except KeyError:
+            resolved = self._resolved[method.name] = self._best(method)
+        if resolved is None:
+            raise UnsupportedMethodError('%s.%s is not supported by this TV' % (method.service, method.name))
+        return resolved
@@ -0,0 +1,222 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from . import methods
+from .cache import ResponseCache
+from .connection import BraviaConnection
+
+
+class BraviaClient(object):
+    """One TV: its connection pool, response cache and service methods.
+
+    Once `capabilities` is set (see negotiate()), every call is sent with the
+    method version the TV supports, and unsupported calls fail locally.
+    """
+
+    def __init__(self, host, psk, pool_size=2, idle_timeout=15, cache=None, metrics=None, latency_budget=None):
+        self.host = host
+        self.connection = BraviaConnection(host, psk, pool_size, idle_timeout, metrics,
+                                           latency_budget=latency_budget)
+        self.metrics = self.connection.metrics
+        self.cache = ResponseCache() if cache is None else cache
+        self.capabilities = None
+
+    def __repr__(self):
+        return 'BraviaClient(%s)' % self.host
+
+    def close(self):
+        self.connection.close()
+
+    # COMMON METHODS
+
+    def post_request(self, service, data):
+        return self.connection.post(service, json.dumps(data).encode("UTF-8"), method=data.get("method"))
+
+    def negotiate(self):
+        """Ask the TV which methods and versions it supports."""
+        from .capabilities import Capabilities
+
+        self.capabilities = Capabilities.probe(self)
+        return self.capabilities
+
+    def call(self, method, *args):
+        if self.capabilities is not None:
+            method = self.capabilities.resolve(method)
+        if self.cache.cacheable(method):
+            response = self.cache.lookup(method, args)
+            if response is None:
+                response = self.connection.post(method.service, method.encode(*args), method=method.name)
+                self.cache.store(method, args, response)
+            return response
+        try:
+            return self.connection.post(method.service, method.encode(*args), method=method.name)
+        finally:
+            self.cache.invalidate_after(method)
+
+    # GUIDE SERVICE
+
+    def get_supported_api_info(self, services=None):
+        return self.call(methods.GET_SUPPORTED_API_INFO, tuple(services or methods.SERVICES))
+
+    # APP CONTROL SERVICE
+
+    def get_application_list(self):
+        return self.call(methods.GET_APPLICATION_LIST)
+
+    def get_application_status_list(self):
+        return self.call(methods.GET_APPLICATION_STATUS_LIST)
+
+    def get_text_form(self):
+        return self.call(methods.GET_TEXT_FORM)
+
+    def get_web_app_status(self):
+        return self.call(methods.GET_WEB_APP_STATUS)
+
+    def set_active_app(self, uri):
+        return self.call(methods.SET_ACTIVE_APP, uri)
+
+    def set_text_form(self, text):
+        return self.call(methods.SET_TEXT_FORM, text)
+
+    def terminate_apps(self):
+        return self.call(methods.TERMINATE_APPS)
+
+    # AUDIO SERVICE
+
+    def get_sound_settings(self):
+        return self.call(methods.GET_SOUND_SETTINGS)
+
+    def get_speaker_settings(self):
+        return self.call(methods.GET_SPEAKER_SETTINGS)
+
+    def get_volume_information(self):
+        return self.call(methods.GET_VOLUME_INFORMATION)
+
+    def set_audio_mute(self, status):
+        return self.call(methods.SET_AUDIO_MUTE, status)
+
+    def mute(self):
+        return self.set_audio_mute(True)
+
+    def unmute(self):
+        return self.set_audio_mute(False)
+
+    def set_audio_volume(self, volume):
+        return self.call(methods.SET_AUDIO_VOLUME, volume)
+
+    def volume_raise(self):
+        return self.set_audio_volume('+2')
+
+    def volume_lower(self):
+        return self.set_audio_volume('-2')
+
+    def set_sound_settings(self, settings):
+        return self.call(methods.SET_SOUND_SETTINGS, settings)
+
+    def set_speaker_settings(self, settings):
+        return self.call(methods.SET_SPEAKER_SETTINGS, settings)
+
+    # AV CONTENT SERVICE
+
+    def get_content_count(self, source, type, target):
+        return self.call(methods.GET_CONTENT_COUNT, source, type, target)
+
+    def get_content_list(self, uri, st_idx, cnt):
+        return self.call(methods.GET_CONTENT_LIST, uri, st_idx, cnt)
+
+    def get_current_external_inputs_status(self):
+        return self.call(methods.GET_CURRENT_EXTERNAL_INPUTS_STATUS)
+
+    def get_scheme_list(self):
+        return self.call(methods.GET_SCHEME_LIST)
+
+    def get_source_list(self, scheme):
+        return self.call(methods.GET_SOURCE_LIST, scheme)
+
+    def get_playing_content_info(self):
+        return self.call(methods.GET_PLAYING_CONTENT_INFO)
+
+    def set_play_content(self, uri):
+        return self.call(methods.SET_PLAY_CONTENT, uri)
+
+    # ENCRYPTION SERVICE
+
+    def get_public_key(self):
+        return self.call(methods.GET_PUBLIC_KEY)
+
+    # SYSTEM SERVICE
+
+    def get_current_time(self):
+        return self.call(methods.GET_CURRENT_TIME)
+
+    def get_interface_information(self):
+        return self.call(methods.GET_INTERFACE_INFORMATION)
+
+    def get_led_indicator_status(self):
+        return self.call(methods.GET_LED_INDICATOR_STATUS)
+
+    def get_network_settings(self):
+        return self.call(methods.GET_NETWORK_SETTINGS)
+
+    def get_power_saving_mode(self):
+        return self.call(methods.GET_POWER_SAVING_MODE)
+
+    def get_power_status(self):
+        return self.call(methods.GET_POWER_STATUS)
+
+    def get_remote_controller_info(self):
+        return self.call(methods.GET_REMOTE_CONTROLLER_INFO)
+
+    def get_remote_device_settings(self):
+        return self.call(methods.GET_REMOTE_DEVICE_SETTINGS)
+
+    def get_system_information(self):
+        return self.call(methods.GET_SYSTEM_INFORMATION)
+
+    def get_system_supported_function(self):
+        return self.call(methods.GET_SYSTEM_SUPPORTED_FUNCTION)
+
+    def get_wol_mode(self):
+        return self.call(methods.GET_WOL_MODE)
+
+    def request_reboot(self):
+        return self.call(methods.REQUEST_REBOOT)
+
+    def set_led_indicator_status(self, mode, status):
+        return self.call(methods.SET_LED_INDICATOR_STATUS, mode, status)
+
+    def set_language(self, language):
+        return self.call(methods.SET_LANGUAGE, language)
+
+    def set_power_saving_mode(self, mode):
+        return self.call(methods.SET_POWER_SAVING_MODE, mode)
+
+    def set_power_status(self, status):
+        return self.call(methods.SET_POWER_STATUS, status)
+
+    def power_on(self):
+        return self.set_power_status(True)
+
+    def power_off(self):
+        return self.set_power_status(False)
+
+    def set_wol_mode(self, mode):
+        return self.call(methods.SET_WOL_MODE, mode)
+
+    # VIDEO SCREEN SERVICE
+
+    def set_scene_setting(self, scene):
+        return self.call(methods.SET_SCENE_SETTING, scene)
@@ -0,0 +1,172 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from . import methods
+from .errors import CircuitOpenError, NotConfiguredError
+from .health import PROBE, CircuitBreaker, split_budget
+from .metrics import Metrics
+from .tracing import tracer
+
+
+class BraviaConnection(object):
+    """Keep-alive HTTP connections to a single TV.
+
+    The TV's embedded web server is slow to accept new connections, so every
+    service shares one bounded pool. The pool is dropped after `idle_timeout`
+    seconds without traffic, before the TV silently closes the sockets itself.
+    Every request is recorded in `metrics` under its service and method.
+
+    Connecting and reading time out after `connect_timeout` and
+    `read_timeout` seconds, cut down to fit `latency_budget` when one is
+    given. `breaker` stops requests to a TV that stopped answering. With no
+    `host`, every request raises NotConfiguredError without being sent.
+    """
+
+    def __init__(self, host, psk, pool_size=2, idle_timeout=15, metrics=None, connect_timeout=2.0,
+                 read_timeout=5.0, latency_budget=None, breaker=None):
+        self.host = host
+        self.metrics = Metrics() if metrics is None else metrics
+        self.timeout = split_budget(latency_budget, connect_timeout, read_timeout)
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self.base_url = 'http://' + host + '/sony/' if host else None
+        self.headers = {
+            'X-Auth-PSK': psk,
+            'Connection': 'keep-alive'
+        }
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._session = None
+        self._last_used = 0
+        self._in_flight = 0
+        # How the next request's connection was opened, until it is sent.
+        self._first = None
+        self._expiry = None
+        self._warming = False
+        self._lock = threading.Lock()
+
+    def _new_session(self):
+        # requests takes most of this package's import time, so it is only
+        # loaded once the first request is sent.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def _acquire(self, warming=False):
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            if self._session is None:
+                self._session = self._new_session()
+                self._first = 'prewarmed' if warming else 'cold'
+            self._in_flight += 1
+            first = None
+            if not warming:
+                first, self._first = self._first, None
+            return self._session, first
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._last_used = time.monotonic()
+
+    def _evict_idle(self, now):
+        if self._session is not None and self._in_flight == 0 \
+                and now - self._last_used > self.idle_timeout:
+            self._session.close()
+            self._session = None
+            self._first = None
+
+    def evict_idle(self):
+        with self._lock:
+            self._evict_idle(time.monotonic())
+
+    def post(self, service, data, headers=None, method=None):
+        if self.breaker.allow() == PROBE:
+            self.probe()
+        return self._send(service, data, headers, method)
+
+    def probe(self):
+        """getPowerStatus, sent even while the circuit is open. Closes it if
+        the TV answers."""
+        return self._send('system', methods.GET_POWER_STATUS.payload, None, methods.GET_POWER_STATUS.name)
+
+    def warm(self):
+        """Open the pooled connection ahead of the next request.
+
+        Does nothing while a connection is open, another warm() is under
+        way or the circuit is open. Otherwise sends a getPowerStatus and
+        returns its response. A connection nothing else uses is dropped
+        after `idle_timeout`.
+        """
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            if self._session is not None or self._warming:
+                return None
+            self._warming = True
+        try:
+            self.breaker.allow()
+            response = self._send('system', methods.GET_POWER_STATUS.payload, None, methods.GET_POWER_STATUS.name,
+                                  warming=True)
+        except CircuitOpenError:
+            return None
+        finally:
+            with self._lock:
+                self._warming = False
+        with self._lock:
+            if self._expiry is not None:
+                self._expiry.cancel()
+            self._expiry = threading.Timer(self.idle_timeout + 0.5, self.evict_idle)
+            self._expiry.daemon = True
+            self._expiry.start()
+        return response
+
+    def _send(self, service, data, headers, method, warming=False):
+        if self.base_url is None:
+            raise NotConfiguredError('No TV address configured')
+        stats = self.metrics.begin(self.host, service, method or service, len(data))
+        start = time.perf_counter()
+        response = None
+        with tracer.span(method or service, 'rpc', service=service, host=self.host):
+            session, first = self._acquire(warming)
+            try:
+                response = session.post(self.base_url + service, data=data, headers=headers, timeout=self.timeout)
+            except OSError as e:
+                self.breaker.failed(e)
+                raise
+            else:
+                self.breaker.succeeded()
+                return response
+            finally:
+                self._release()
+                elapsed = time.perf_counter() - start
+                self.metrics.end(stats, elapsed, response)
+                if first is not None and response is not None:
+                    self.metrics.first_request(self.host, first, elapsed)
+
+    def close(self):
+        with self._lock:
+            if self._expiry is not None:
+                self._expiry.cancel()
+                self._expiry = None
+            self._first = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,183 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import difflib
+import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+from . import result
+
+# getContentList rejects pages larger than 200 items.
+PAGE_SIZE = 50
+
+
+def content_count(client, uri):
+    return result(client.get_content_count(uri, "", ""))[0]["count"]
+
+
+def iter_content_list(client, uri, page_size=PAGE_SIZE, total=None):
+    """Yield every item of a channel or input list, one page at a time.
+
+    The next page is requested while the current one is consumed. Closing the
+    generator early (e.g. breaking out of a search) stops the walk without
+    waiting for the page in flight.
+    """
+    if total is None:
+        total = content_count(client, uri)
+    if total <= 0:
+        return
+
+    def fetch(start):
+        return result(client.get_content_list(uri, start, min(page_size, total - start)))[0]
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bravia-content')
+    try:
+        pending = pool.submit(fetch, 0)
+        for start in range(0, total, page_size):
+            page = pending.result()
+            if start + page_size < total and page:
+                pending = pool.submit(fetch, start + page_size)
+            if not page:
+                return
+            yield from page
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def find_content(client, uri, predicate, page_size=PAGE_SIZE, total=None):
+    for item in iter_content_list(client, uri, page_size, total):
+        if predicate(item):
+            return item
+    return None
+
+
+async def aiter_content_list(client, uri, page_size=PAGE_SIZE, total=None):
+    # Only needed once an event loop is running; keeps asyncio out of the
+    # synchronous import path.
+    import asyncio
+
+    if total is None:
+        total = result(await client.get_content_count(uri, "", ""))[0]["count"]
+    if total <= 0:
+        return
+
+    async def fetch(start):
+        return result(await client.get_content_list(uri, start, min(page_size, total - start)))[0]
+
+    pending = asyncio.ensure_future(fetch(0))
+    try:
+        for start in range(0, total, page_size):
+            page = await pending
+            if start + page_size < total and page:
+                pending = asyncio.ensure_future(fetch(start + page_size))
+            if not page:
+                return
+            for item in page:
+                yield item
+    finally:
+        if not pending.done():
+            pending.cancel()
+
+
+async def afind_content(client, uri, predicate, page_size=PAGE_SIZE, total=None):
+    items = aiter_content_list(client, uri, page_size, total)
+    try:
+        async for item in items:
+            if predicate(item):
+                return item
+        return None
+    finally:
+        await items.aclose()
+
+
+def normalize_name(name):
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r'[^0-9a-z]+', '', name.lower())
+
+
+def number_key(number):
+    parts = re.split(r'[.\-]', str(number).strip())
+    return '.'.join(part.lstrip('0') or '0' for part in parts)
+
+
+class ChannelIndex(object):
+    """Local lookup tables for the TV's channel lists.
+
+    Maps display numbers and normalized channel names to content URIs, so
+    tuning a channel costs a single setPlayContent call. refresh() compares
+    getContentCount per source and only walks the sources that changed.
+    """
+
+    def __init__(self, client, sources=None):
+        self.client = client
+        self.sources = sources
+        self.by_number = {}
+        self.by_name = {}
+        self._counts = {}
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.by_number)
+
+    def _tv_sources(self):
+        if self.sources is not None:
+            return self.sources
+        return [source["source"] for source in result(self.client.get_source_list("tv"))[0]]
+
+    def refresh(self):
+        with self._lock:
+            sources = self._tv_sources()
+            changed = False
+            for source in sources:
+                count = content_count(self.client, source)
+                if self._counts.get(source) == count:
+                    continue
+                self._items[source] = list(iter_content_list(self.client, source, total=count))
+                self._counts[source] = count
+                changed = True
+            for source in set(self._items) - set(sources):
+                del self._items[source]
+                del self._counts[source]
+                changed = True
+            if changed:
+                self._rebuild(sources)
+            return changed
+
+    def _rebuild(self, sources):
+        by_number = {}
+        by_name = {}
+        for source in sources:
+            for item in self._items[source]:
+                if item.get("dispNum"):
+                    by_number.setdefault(number_key(item["dispNum"]), item["uri"])
+                if item.get("title"):
+                    by_name.setdefault(normalize_name(item["title"]), item["uri"])
+        self.by_number = by_number
+        self.by_name = by_name
+
+    def uri_for_number(self, number):
+        return self.by_number.get(number_key(number))
+
+    def uri_for_name(self, name, cutoff=0.75):
+        key = normalize_name(name)
+        uri = self.by_name.get(key)
+        if uri is None and key:
+            matches = difflib.get_close_matches(key, list(self.by_name), 1, cutoff)
+            if matches:
+                uri = self.by_name[matches[0]]
+        return uri
@@ -0,0 +1,206 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+from xml.etree import ElementTree
+
+from .errors import BraviaError
+
+SSDP_ADDRESS = ('239.255.255.250', 1900)
+SCALAR_WEB_API = 'urn:schemas-sony-com:service:ScalarWebAPI:1'
+
+M_SEARCH = ('M-SEARCH * HTTP/1.1\r\n'
+            'HOST: 239.255.255.250:1900\r\n'
+            'MAN: "ssdp:discover"\r\n'
+            'MX: %d\r\n'
+            'ST: %s\r\n'
+            '\r\n')
+
+
+def parse_ssdp_response(data):
+    lines = data.decode('latin-1').split('\r\n')
+    if not lines or ' 200 ' not in lines[0] + ' ':
+        return None
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+DESCRIPTION_FIELDS = ('friendlyName', 'modelName', 'serialNumber', 'UDN', 'X_ScalarWebAPI_BaseURL')
+
+
+def describe(location, timeout=2.0):
+    """Read name, model, serial, UDN and the ScalarWebAPI base URL from a
+    UPnP device description."""
+    import urllib.request  # slow to import; only needed once a TV answers
+
+    with urllib.request.urlopen(location, timeout=timeout) as f:
+        root = ElementTree.fromstring(f.read())
+    device = {}
+    for element in root.iter():
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag in DESCRIPTION_FIELDS and tag not in device:
+            device[tag] = (element.text or '').strip()
+    return device
+
+
+class DeviceRegistry(object):
+    """TVs seen on the network, keyed by serial number or MAC address.
+
+    Stored as compact JSON at `path` and read the first time it is used.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._devices = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._devices is None:
+            try:
+                with open(self.path) as f:
+                    self._devices = json.load(f)
+            except (OSError, ValueError):
+                self._devices = {}
+        return self._devices
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key)
+
+    def host(self, key):
+        device = self.get(key)
+        return device['host'] if device else None
+
+    def devices(self):
+        with self._lock:
+            return dict(self._load())
+
+    def update(self, key, **fields):
+        with self._lock:
+            device = self._load().setdefault(key, {})
+            device.update(fields)
+            device['last_seen'] = time.time()
+
+    def save(self):
+        with self._lock:
+            data = self._load()
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+
+
+class SsdpDiscovery(object):
+    """Finds Bravia TVs by their ScalarWebAPI SSDP announcement.
+
+    Each answer is described from its UPnP device description. It is keyed
+    by the serial number there or, failing that, by `identify(host)` (for
+    example the serial or MAC from getSystemInformation), or by the UDN.
+    """
+
+    def __init__(self, registry, identify=None, timeout=3.0, mx=2, address=SSDP_ADDRESS,
+                 search_target=SCALAR_WEB_API):
+        self.registry = registry
+        self.identify = identify
+        self.timeout = timeout
+        self.mx = mx
+        self.address = address
+        self.search_target = search_target
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _answers(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
+            sock.sendto((M_SEARCH % (self.mx, self.search_target)).encode('latin-1'), self.address)
+            end = time.monotonic() + self.timeout
+            locations = {}
+            while True:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return locations
+                sock.settimeout(remaining)
+                try:
+                    data, _ = sock.recvfrom(2048)
+                except socket.timeout:
+                    return locations
+                headers = parse_ssdp_response(data)
+                if headers and headers.get('location'):
+                    locations[headers['location']] = headers
+        finally:
+            sock.close()
+
+    def _key(self, host, device):
+        if device.get('serialNumber'):
+            return device['serialNumber']
+        if self.identify is not None:
+            try:
+                key = self.identify(host)
+            except (BraviaError, OSError, LookupError):
+                key = None
+            if key:
+                return key
+        return device.get('UDN') or host
+
+    def search(self):
+        """Search once and return the registry keys that answered."""
+        found = []
+        for location, headers in self._answers().items():
+            try:
+                device = describe(location)
+            except (OSError, ElementTree.ParseError):
+                device = {'UDN': headers.get('usn', '').split('::')[0]}
+            # The description is served from the UPnP port; the JSON-RPC API
+            # lives at the base URL it advertises, or port 80 by default.
+            if device.get('X_ScalarWebAPI_BaseURL'):
+                host = urlparse(device['X_ScalarWebAPI_BaseURL']).netloc
+            else:
+                host = urlparse(location).hostname
+            key = self._key(host, device)
+            self.registry.update(key, host=host, location=location,
+                                 name=device.get('friendlyName', ''), model=device.get('modelName', ''))
+            found.append(key)
+        if found:
+            self.registry.save()
+        return found
+
+    def search_in_background(self, on_done=None):
+        """Start a search unless one is running. `on_done(keys)` is called after."""
+        def run():
+            try:
+                found = self.search()
+            except OSError:
+                found = []
+            finally:
+                with self._lock:
+                    self._thread = None
+            if on_done is not None:
+                on_done(found)
+
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=run, name='bravia-ssdp', daemon=True)
+            self._thread.start()
+            return True
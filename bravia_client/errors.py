@@ -0,0 +1,45 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class BraviaError(Exception):
+    pass
+
+
+class ResponseMismatchError(BraviaError):
+    pass
+
+
+class QueueFullError(BraviaError):
+    pass
+
+
+class RpcError(BraviaError):
+
+    def __init__(self, code, message):
+        super(RpcError, self).__init__('%s (%s)' % (message, code))
+        self.code = code
+        self.message = message
+
+
+class UnsupportedMethodError(BraviaError):
+    pass
+
+
+class CircuitOpenError(BraviaError):
+    pass
+
+
+class NotConfiguredError(BraviaError):
+    pass
@@ -0,0 +1,293 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from . import result
+from .errors import QueueFullError
+from .tracing import tracer
+
+LOG = logging.getLogger(__name__)
+
+POWER = 0
+INPUT = 1
+VOLUME = 2
+SETTINGS = 3
+BACKGROUND = 4
+
+# Priority class and collapse key of each command. Pending commands with the
+# same key are merged: the newest function and arguments win and the command
+# keeps its place in the queue. Commands with no key always run.
+COMMANDS = {
+    'set_power_status': (POWER, 'power'),
+    'power_on': (POWER, 'power'),
+    'power_off': (POWER, 'power'),
+    'request_reboot': (POWER, None),
+    'set_play_content': (INPUT, 'input'),
+    'set_active_app': (INPUT, 'input'),
+    'terminate_apps': (INPUT, None),
+    'set_audio_volume': (VOLUME, 'volume'),
+    'volume_raise': (VOLUME, None),
+    'volume_lower': (VOLUME, None),
+    'set_audio_mute': (VOLUME, 'mute'),
+    'mute': (VOLUME, 'mute'),
+    'unmute': (VOLUME, 'mute'),
+    'set_scene_setting': (SETTINGS, 'scene'),
+    'set_led_indicator_status': (SETTINGS, 'led'),
+    'set_power_saving_mode': (SETTINGS, 'power_saving'),
+    'set_wol_mode': (SETTINGS, 'wol'),
+    'set_language': (SETTINGS, 'language'),
+}
+
+
+def classify(func, args):
+    priority, key = COMMANDS.get(getattr(func, '__name__', ''), (BACKGROUND, None))
+    if key == 'volume' and args and str(args[0])[:1] in '+-':
+        # Relative steps add up, so they must never replace each other.
+        key = None
+    return priority, key
+
+
+class Command(object):
+
+    def __init__(self, func, args, on_done=None, on_error=None, priority=None, key=None):
+        self.func = func
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.priority = priority
+        self.key = key
+        self.enqueued_at = time.monotonic()
+        # The span that queued the command, e.g. an intent, when tracing.
+        self.parent = tracer.current()
+
+    def run(self):
+        name = getattr(self.func, '__name__', 'command')
+        if tracer.enabled:
+            tracer.record('queue.wait', self.enqueued_at, time.monotonic(), 'queue', self.parent,
+                          command=name, priority=self.priority)
+        with tracer.span(name, 'command', self.parent, priority=self.priority):
+            try:
+                value = self.func(*self.args)
+                if hasattr(value, 'status_code'):
+                    result(value)
+            except Exception as e:
+                # Not only BraviaError and OSError: anything else would take
+                # the executor's only thread down with it.
+                self.fail(e)
+                return
+            if self.on_done is not None:
+                self.on_done(value)
+
+    def fail(self, error):
+        if self.on_error is not None:
+            self.on_error(error)
+        else:
+            LOG.warning('%s failed: %r', getattr(self.func, '__name__', 'command'), error)
+
+
+class CommandQueue(object):
+    """Priority queue of commands for one TV.
+
+    Commands leave in priority order (power, input, volume, settings,
+    background), FIFO within a class. Once `max_depth` commands are pending,
+    the `policy` decides what happens to a new one:
+    - 'drop-lowest' drops the newest pending command of the lowest class if
+      that class is below the new command's, and refuses the new one
+      otherwise,
+    - 'reject' refuses the new command,
+    - 'block' waits up to `block_timeout` seconds for room, then refuses it.
+    A dropped or refused command gets a QueueFullError through on_error.
+    """
+
+    def __init__(self, max_depth=32, policy='drop-lowest', block_timeout=5.0):
+        if policy not in ('drop-lowest', 'reject', 'block'):
+            raise ValueError('Unknown backpressure policy: %s' % policy)
+        self.max_depth = max_depth
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.collapsed = 0
+        self.dropped = 0
+        self.max_seen_depth = 0
+        self.dequeued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._heap = []
+        self._pending = {}
+        self._seq = itertools.count()
+        self._closed = False
+        self._held = 0
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def put(self, command):
+        with self._cond:
+            pending = self._pending.get(command.key) if command.key is not None else None
+            if pending is not None:
+                # The key stands for one setting of the TV, which several
+                # functions may set (power_on, power_off): the newest one
+                # wins, function and all, and keeps the older one's place.
+                if pending.priority != command.priority:
+                    self._heap = [(command.priority, seq, queued) if queued is pending else (priority, seq, queued)
+                                  for priority, seq, queued in self._heap]
+                    heapq.heapify(self._heap)
+                    pending.priority = command.priority
+                pending.func = command.func
+                pending.parent = command.parent
+                pending.args = command.args
+                pending.on_done = command.on_done
+                pending.on_error = command.on_error
+                self.collapsed += 1
+                return True
+
+            if len(self._heap) >= self.max_depth and not self._make_room(command):
+                self.dropped += 1
+                refused = True
+            else:
+                heapq.heappush(self._heap, (command.priority, next(self._seq), command))
+                if command.key is not None:
+                    self._pending[command.key] = command
+                self.enqueued += 1
+                self.max_seen_depth = max(self.max_seen_depth, len(self._heap))
+                self._cond.notify()
+                refused = False
+        if refused:
+            command.fail(QueueFullError('Command queue is full'))
+        return not refused
+
+    def _make_room(self, command):
+        if self.policy == 'reject':
+            return False
+        if self.policy == 'block':
+            return self._cond.wait_for(lambda: len(self._heap) < self.max_depth, self.block_timeout)
+
+        victim = max(self._heap, key=lambda entry: (entry[0], entry[1]))
+        if victim[0] <= command.priority:
+            return False
+        self._heap.remove(victim)
+        heapq.heapify(self._heap)
+        self._forget(victim[2])
+        self.dropped += 1
+        threading.Thread(target=victim[2].fail, args=(QueueFullError('Dropped by a newer command'),),
+                         daemon=True).start()
+        return True
+
+    def _forget(self, command):
+        if command.key is not None and self._pending.get(command.key) is command:
+            del self._pending[command.key]
+
+    def get(self, timeout=None):
+        with self._cond:
+            ready = self._cond.wait_for(lambda: (self._heap and not self._held) or self._closed, timeout)
+            if not ready or not self._heap:
+                return None
+            command = heapq.heappop(self._heap)[2]
+            self._forget(command)
+            wait = time.monotonic() - command.enqueued_at
+            self.dequeued += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._cond.notify_all()
+            return command
+
+    def hold(self):
+        """Keep commands queued until release(), e.g. while the TV boots."""
+        with self._cond:
+            self._held += 1
+
+    def release(self):
+        with self._cond:
+            self._held -= 1
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'depth': len(self._heap),
+                'max_depth_seen': self.max_seen_depth,
+                'enqueued': self.enqueued,
+                'collapsed': self.collapsed,
+                'dropped': self.dropped,
+                'mean_wait': self.total_wait / self.dequeued if self.dequeued else 0.0,
+                'max_wait': self.max_wait
+            }
+
+
+class CommandExecutor(object):
+    """Sends commands to one TV from a background thread.
+
+    submit() returns at once. When the command has run, `on_done` gets its
+    return value, or `on_error` gets the exception if the request failed,
+    the TV answered with a JSON-RPC error or the function raised. Ordering,
+    merging and the queue bound are handled by CommandQueue.
+    """
+
+    def __init__(self, name='bravia-commands', max_depth=32, policy='drop-lowest'):
+        self.name = name
+        self.queue = CommandQueue(max_depth, policy)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, on_done=None, on_error=None, priority=None, key=None):
+        default_priority, default_key = classify(func, args)
+        command = Command(func, args, on_done, on_error,
+                          default_priority if priority is None else priority,
+                          default_key if key is None else key)
+        self._start()
+        return self.queue.put(command)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            command = self.queue.get()
+            if command is None:
+                return
+            try:
+                command.run()
+            except Exception:
+                # A failing on_done or on_error callback.
+                LOG.exception('Command callback failed')
+
+    def hold(self):
+        self.queue.hold()
+
+    def release(self):
+        self.queue.release()
+
+    def stats(self):
+        return self.queue.stats()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self.queue.close()
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,112 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from . import result
+from .client import BraviaClient
+from .errors import BraviaError
+
+
+class FleetResult(object):
+
+    def __init__(self, results, errors, wall_time):
+        self.results = results
+        self.errors = errors
+        self.wall_time = wall_time
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return 'FleetResult(%d ok, %d failed, %.3fs)' % (len(self.results), len(self.errors), self.wall_time)
+
+
+class BraviaFleet(object):
+    """Several TVs driven together.
+
+    broadcast() calls the same BraviaClient method on every TV through a pool
+    of at most `max_workers` threads. It returns the responses and errors per
+    host, and how long the whole fan-out took.
+    """
+
+    def __init__(self, clients=(), max_workers=8):
+        self.max_workers = max_workers
+        self.clients = {}
+        self._pool = None
+        self._lock = threading.Lock()
+        for client in clients:
+            self.add(client)
+
+    @classmethod
+    def from_hosts(cls, hosts, psk, max_workers=8, **client_options):
+        return cls([BraviaClient(host, psk, **client_options) for host in hosts], max_workers)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def add(self, client):
+        self.clients[client.host] = client
+
+    def remove(self, host):
+        client = self.clients.pop(host, None)
+        if client is not None:
+            client.close()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bravia-fleet')
+            return self._pool
+
+    @staticmethod
+    def _run(client, name, args):
+        response = getattr(client, name)(*args)
+        if hasattr(response, 'status_code'):
+            result(response)
+        return response
+
+    def broadcast(self, name, *args, timeout=None):
+        start = time.perf_counter()
+        pool = self._executor()
+        futures = {pool.submit(self._run, client, name, args): host for host, client in self.clients.items()}
+        done, not_done = wait(futures, timeout)
+        results = {}
+        errors = {}
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except (BraviaError, OSError) as e:
+                errors[futures[future]] = e
+        for future in not_done:
+            future.cancel()
+            errors[futures[future]] = TimeoutError('No answer within %ss' % timeout)
+        return FleetResult(results, errors, time.perf_counter() - start)
+
+    def power_off(self, timeout=None):
+        return self.broadcast('power_off', timeout=timeout)
+
+    def power_on(self, timeout=None):
+        return self.broadcast('power_on', timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        for client in self.clients.values():
+            client.close()
@@ -0,0 +1,104 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from .errors import CircuitOpenError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# What allow() tells the connection to do.
+CALL = 'call'
+PROBE = 'probe'
+
+
+def split_budget(latency_budget, connect_timeout, read_timeout):
+    """Connect and read timeouts that add up to at most `latency_budget`."""
+    if latency_budget is None:
+        return connect_timeout, read_timeout
+    connect = min(connect_timeout, latency_budget / 3.0)
+    return connect, min(read_timeout, latency_budget - connect)
+
+
+class CircuitBreaker(object):
+    """Tracks whether a TV answers and stops sending to it while it does not.
+
+    After `failure_threshold` network failures in a row the circuit opens,
+    and calls fail at once with CircuitOpenError. `reset_timeout` seconds
+    later the next call is told to probe the TV first (half-open). A probe
+    that succeeds closes the circuit; one that fails keeps it open for
+    another `reset_timeout`. JSON-RPC errors count as answers.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self.probes = 0
+        self.last_error = None
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.state != CLOSED
+
+    def allow(self):
+        """CALL or PROBE, or raises CircuitOpenError."""
+        with self._lock:
+            if self.state == CLOSED:
+                return CALL
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self.probes += 1
+                return PROBE
+            self.rejected += 1
+            raise CircuitOpenError('TV not answering (%s), retrying in %.0fs'
+                                   % (type(self.last_error).__name__,
+                                      max(0.0, self._opened_at + self.reset_timeout - time.monotonic())))
+
+    def succeeded(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def failed(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                if self.state == CLOSED:
+                    self.opened += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self):
+        self.succeeded()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'opened': self.opened,
+                'rejected': self.rejected,
+                'probes': self.probes,
+                'last_error': str(self.last_error) if self.last_error else None
+            }
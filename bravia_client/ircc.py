@@ -0,0 +1,101 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from . import result
+from .errors import BraviaError
+
+IRCC_SERVICE = 'IRCC'
+
+IRCC_HEADERS = {
+    'Content-Type': 'text/xml; charset=UTF-8',
+    'SOAPACTION': '"urn:schemas-sony-com:service:IRCC:1#X_SendIRCC"'
+}
+
+IRCC_ENVELOPE = ('<?xml version="1.0"?>'
+                 '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" '
+                 's:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/">'
+                 '<s:Body>'
+                 '<u:X_SendIRCC xmlns:u="urn:schemas-sony-com:service:IRCC:1">'
+                 '<IRCCCode>%s</IRCCCode>'
+                 '</u:X_SendIRCC>'
+                 '</s:Body>'
+                 '</s:Envelope>')
+
+
+class UnknownKeyError(BraviaError):
+    pass
+
+
+def channel_keys(number):
+    """Keys that type a channel number, e.g. 72 -> Num7, Num2, Confirm."""
+    return ['Num' + digit for digit in str(number) if digit.isdigit()] + ['Confirm']
+
+
+class IrccRemote(object):
+    """Sends remote control keys over the TV's IRCC SOAP endpoint.
+
+    The key name -> IRCC code map is loaded once, from `codes` (e.g. the
+    device profile's remote_codes) or getRemoteControllerInfo, and a SOAP body
+    is built once per key. Keys go through the client's keep-alive
+    connection, `spacing` seconds apart so the TV does not drop any.
+    """
+
+    def __init__(self, client, codes=None, spacing=0.1):
+        self.client = client
+        self.spacing = spacing
+        self._codes = dict(codes) if codes else None
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    @property
+    def codes(self):
+        with self._lock:
+            if self._codes is None:
+                reply = result(self.client.get_remote_controller_info())
+                self._codes = {code["name"]: code["value"] for code in reply[1]}
+            return self._codes
+
+    def _body(self, key):
+        if key.isdigit():
+            key = 'Num' + key
+        body = self._bodies.get(key)
+        if body is None:
+            code = self.codes.get(key)
+            if code is None:
+                raise UnknownKeyError('The TV has no remote key named %s' % key)
+            body = self._bodies[key] = (IRCC_ENVELOPE % code).encode("UTF-8")
+        return body
+
+    def _post(self, key, body):
+        response = self.client.connection.post(IRCC_SERVICE, body, IRCC_HEADERS, method='X_SendIRCC')
+        if response.status_code != 200:
+            raise BraviaError('IRCC %s failed with HTTP %d' % (key, response.status_code))
+        return response
+
+    def send(self, key):
+        return self._post(key, self._body(key))
+
+    def send_sequence(self, keys, spacing=None):
+        spacing = self.spacing if spacing is None else spacing
+        bodies = [self._body(key) for key in keys]
+        for i, (key, body) in enumerate(zip(keys, bodies)):
+            if i and spacing:
+                time.sleep(spacing)
+            self._post(key, body)
+
+    def send_channel(self, number, spacing=None):
+        self.send_sequence(channel_keys(number), spacing)
@@ -0,0 +1,193 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+_ID = '\x00id\x00'
+
+
+class Param(object):
+    """Placeholder for a value supplied when the method is called."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class RpcMethod(object):
+    """A JSON-RPC method with its request envelope serialized ahead of time.
+
+    The envelope is encoded once with markers in place of the id and every
+    Param. encode() only has to serialize the call arguments and join them
+    with the cached byte chunks, and a call with no arguments and the default
+    id returns the cached payload as is.
+
+    `other_versions` maps the other versions this package knows how to send
+    to their params, which may be shaped differently but must take the same
+    arguments. A version missing from it cannot be sent.
+    """
+
+    def __init__(self, service, name, version, id, params=(), other_versions=None):
+        self.service = service
+        self.name = name
+        self.version = version
+        self.id = id
+        self.params = list(params)
+        self.arg_names = []
+        self.templates = dict(other_versions or {})
+        self.templates[version] = self.params
+        self._variants = {}
+
+        markers = {}
+        data = {
+            "method": name,
+            "id": _ID,
+            "params": self._mark(self.params, markers),
+            "version": version
+        }
+        text = json.dumps(data)
+        for marker in [_ID] + list(markers):
+            text = text.replace(json.dumps(marker), '\x00', 1)
+        self._chunks = [chunk.encode("UTF-8") for chunk in text.split('\x00')]
+        self.arg_names = list(markers.values())
+        self.payload = self._join([str(id).encode("UTF-8")])
+
+    def _mark(self, value, markers):
+        if isinstance(value, Param):
+            marker = '\x00%d\x00' % len(markers)
+            markers[marker] = value.name
+            return marker
+        if isinstance(value, dict):
+            return {k: self._mark(v, markers) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._mark(v, markers) for v in value]
+        return value
+
+    def _join(self, values):
+        chunks = self._chunks
+        parts = [chunks[0]]
+        for i, value in enumerate(values, 1):
+            parts.append(value)
+            parts.append(chunks[i])
+        return b''.join(parts)
+
+    def encode(self, *args, request_id=None):
+        if len(args) != len(self.arg_names):
+            raise TypeError('%s takes %d arguments (%d given)' % (self.name, len(self.arg_names), len(args)))
+        if not args and request_id is None:
+            return self.payload
+        values = [str(self.id if request_id is None else request_id).encode("UTF-8")]
+        values.extend(json.dumps(arg).encode("UTF-8") for arg in args)
+        return self._join(values)
+
+    def with_version(self, version):
+        """The same call sent as `version`, with that version's params.
+        Variants are built once."""
+        if version == self.version:
+            return self
+        variant = self._variants.get(version)
+        if variant is None:
+            if version not in self.templates:
+                raise ValueError('No params known for %s v%s' % (self.name, version))
+            variant = RpcMethod(self.service, self.name, version, self.id, self.templates[version])
+            if variant.arg_names != self.arg_names:
+                raise ValueError('%s v%s takes other arguments than v%s' % (self.name, version, self.version))
+            self._variants[version] = variant
+        return variant
+
+    def __repr__(self):
+        return 'RpcMethod(%s.%s v%s)' % (self.service, self.name, self.version)
+
+
+registry = {}
+
+
+def register(service, name, version, id, params=(), other_versions=None):
+    method = RpcMethod(service, name, version, id, params, other_versions)
+    registry[name] = method
+    return method
+
+
+# GUIDE SERVICE
+
+GET_SUPPORTED_API_INFO = register('guide', "getSupportedApiInfo", "1.0", 101,
+                                  [{"services": Param('services')}])
+
+# APP CONTROL SERVICE
+
+GET_APPLICATION_LIST = register('appControl', "getApplicationList", "1.0", 201)
+GET_APPLICATION_STATUS_LIST = register('appControl', "getApplicationStatusList", "1.0", 202)
+GET_TEXT_FORM = register('appControl', "getTextForm", "1.1", 203, [{}], {"1.0": []})
+GET_WEB_APP_STATUS = register('appControl', "getWebAppStatus", "1.0", 204)
+SET_ACTIVE_APP = register('appControl', "setActiveApp", "1.0", 205, [{"uri": Param('uri')}])
+SET_TEXT_FORM = register('appControl', "setTextForm", "1.1", 206, [{"encKey": "", "text": Param('text')}],
+                         {"1.0": [Param('text')]})
+TERMINATE_APPS = register('appControl', "terminateApps", "1.0", 207)
+
+# AUDIO SERVICE
+
+GET_SOUND_SETTINGS = register('audio', "getSoundSettings", "1.1", 301, [{"target": ""}])
+GET_SPEAKER_SETTINGS = register('audio', "getSpeakerSettings", "1.0", 302, [{"target": ""}])
+GET_VOLUME_INFORMATION = register('audio', "getVolumeInformation", "1.0", 303)
+SET_AUDIO_MUTE = register('audio', "setAudioMute", "1.0", 304, [{"status": Param('status')}])
+SET_AUDIO_VOLUME = register('audio', "setAudioVolume", "1.2", 305,
+                            [{"volume": Param('volume'), "ui": "on", "target": "speaker"}],
+                            {"1.0": [{"volume": Param('volume'), "target": "speaker"}]})
+SET_SOUND_SETTINGS = register('audio', "setSoundSettings", "1.1", 306, [{"settings": Param('settings')}])
+SET_SPEAKER_SETTINGS = register('audio', "setSpeakerSettings", "1.0", 307, [{"settings": Param('settings')}])
+
+# AV CONTENT SERVICE
+
+GET_CONTENT_COUNT = register('avContent', "getContentCount", "1.0", 401,
+                             [{"source": Param('source'), "type": Param('type'), "target": Param('target')}])
+GET_CONTENT_LIST = register('avContent', "getContentList", "1.5", 402,
+                            [{"uri": Param('uri'), "stIdx": Param('st_idx'), "cnt": Param('cnt')}],
+                            {"1.0": [{"source": Param('uri'), "stIdx": Param('st_idx'), "cnt": Param('cnt'),
+                                      "type": "", "target": ""}]})
+GET_CURRENT_EXTERNAL_INPUTS_STATUS = register('avContent', "getCurrentExternalInputsStatus", "1.1", 403)
+GET_SCHEME_LIST = register('avContent', "getSchemeList", "1.0", 404)
+GET_SOURCE_LIST = register('avContent', "getSourceList", "1.0", 405, [{"scheme": Param('scheme')}])
+GET_PLAYING_CONTENT_INFO = register('avContent', "getPlayingContentInfo", "1.0", 406)
+SET_PLAY_CONTENT = register('avContent', "setPlayContent", "1.0", 407, [{"uri": Param('uri')}])
+
+# ENCRYPTION SERVICE
+
+GET_PUBLIC_KEY = register('encryption', "getPublicKey", "1.0", 501)
+
+# SYSTEM SERVICE
+
+GET_CURRENT_TIME = register('system', "getCurrentTime", "1.1", 601)
+GET_INTERFACE_INFORMATION = register('system', "getInterfaceInformation", "1.0", 602)
+GET_LED_INDICATOR_STATUS = register('system', "getLEDIndicatorStatus", "1.0", 603)
+GET_NETWORK_SETTINGS = register('system', "getNetworkSettings", "1.0", 604, [{"netif": ""}])
+GET_POWER_SAVING_MODE = register('system', "getPowerSavingMode", "1.0", 605)
+GET_POWER_STATUS = register('system', "getPowerStatus", "1.0", 606)
+GET_REMOTE_CONTROLLER_INFO = register('system', "getRemoteControllerInfo", "1.0", 607)
+GET_REMOTE_DEVICE_SETTINGS = register('system', "getRemoteDeviceSettings", "1.0", 608, [{"target": ""}])
+GET_SYSTEM_INFORMATION = register('system', "getSystemInformation", "1.0", 609)
+GET_SYSTEM_SUPPORTED_FUNCTION = register('system', "getSystemSupportedFunction", "1.0", 610)
+GET_WOL_MODE = register('system', "getWolMode", "1.0", 611)
+REQUEST_REBOOT = register('system', "requestReboot", "1.0", 612)
+SET_LED_INDICATOR_STATUS = register('system', "setLEDIndicatorStatus", "1.1", 613,
+                                    [{"mode": Param('mode'), "status": Param('status')}])
+SET_LANGUAGE = register('system', "setLanguage", "1.0", 614, [{"language": Param('language')}])
+SET_POWER_SAVING_MODE = register('system', "setPowerSavingMode", "1.0", 615, [{"mode": Param('mode')}])
+SET_POWER_STATUS = register('system', "setPowerStatus", "1.0", 616, [{"status": Param('status')}])
+SET_WOL_MODE = register('system', "setWolMode", "1.0", 617, [{"enabled": Param('mode')}])
+
+# VIDEO SCREEN SERVICE
+
+SET_SCENE_SETTING = register('videoScreen', "setSceneSetting", "1.0", 701, [{"value": Param('scene')}])
+
+# Every service with a registered method, in registration order.
+SERVICES = list(dict.fromkeys(method.service for method in registry.values()))
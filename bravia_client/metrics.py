@@ -0,0 +1,187 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import json
+import threading
+from collections import Counter
+
+# Upper bounds in seconds of the latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def rpc_error_code(content):
+    """The JSON-RPC error code in a response body, or None."""
+    if b'"error"' not in content:
+        return None
+    try:
+        return json.loads(content)["error"][0]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+class MethodStats(object):
+    """Counters for one (host, service, method). Fixed size but for the
+    status and error code counters, which only see a handful of values."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.seconds = 0.0
+        self.requests = 0
+        self.statuses = Counter()
+        self.rpc_errors = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.seconds += seconds
+        self.requests += 1
+
+    def snapshot(self):
+        return {
+            'requests': self.requests,
+            'seconds': self.seconds,
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+            'statuses': {str(k): v for k, v in self.statuses.items()},
+            'rpc_errors': {str(k): v for k, v in self.rpc_errors.items()},
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'in_flight': self.in_flight
+        }
+
+
+def _labels(**labels):
+    return ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                    for name, value in labels.items())
+
+
+class Metrics(object):
+    """Request metrics keyed by host, service and method name.
+
+    Connections call begin() before sending and end() once the response is
+    read (or the request failed). snapshot() returns plain dicts for the
+    message bus; prometheus() renders the text exposition format.
+
+    The first request on a new pooled connection is also recorded apart,
+    as "cold" when it opened the connection itself or "prewarmed" when the
+    connection was opened ahead of it.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._stats = {}
+        self._first = {}
+        self._lock = threading.Lock()
+
+    def begin(self, host, service, method, sent):
+        key = (host, service, method)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = MethodStats(self.buckets)
+            stats.in_flight += 1
+            stats.bytes_sent += sent
+        return stats
+
+    def end(self, stats, seconds, response=None):
+        """`response` is None when no reply arrived (e.g. a network error)."""
+        if response is None:
+            status, received, code = 'exception', 0, None
+        else:
+            status, received, code = response.status_code, len(response.content), rpc_error_code(response.content)
+        with self._lock:
+            stats.in_flight -= 1
+            stats.observe(seconds)
+            stats.statuses[status] += 1
+            stats.bytes_received += received
+            if code is not None:
+                stats.rpc_errors[code] += 1
+
+    def first_request(self, host, connection, seconds):
+        with self._lock:
+            stats = self._first.get((host, connection))
+            if stats is None:
+                stats = self._first[(host, connection)] = MethodStats(self.buckets)
+            stats.observe(seconds)
+
+    def first_requests(self):
+        with self._lock:
+            return [{
+                'host': host,
+                'connection': connection,
+                'requests': stats.requests,
+                'seconds': stats.seconds,
+                'buckets': stats.snapshot()['buckets']
+            } for (host, connection), stats in sorted(self._first.items())]
+
+    def snapshot(self):
+        with self._lock:
+            return [dict(stats.snapshot(), host=host, service=service, method=method)
+                    for (host, service, method), stats in sorted(self._stats.items())]
+
+    def prometheus(self):
+        lines = []
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines.append('# HELP bravia_request_duration_seconds Round trip time of TV requests.')
+            lines.append('# TYPE bravia_request_duration_seconds histogram')
+            for (host, service, method), stats in items:
+                labels = _labels(host=host, service=service, method=method)
+                total = 0
+                for bound, count in zip([str(b) for b in stats.buckets] + ['+Inf'], stats.counts):
+                    total += count
+                    lines.append('bravia_request_duration_seconds_bucket{%s,le="%s"} %d' % (labels, bound, total))
+                lines.append('bravia_request_duration_seconds_sum{%s} %r' % (labels, stats.seconds))
+                lines.append('bravia_request_duration_seconds_count{%s} %d' % (labels, stats.requests))
+
+            lines.append('# HELP bravia_first_request_duration_seconds First request on a new connection, '
+                         'opened by it (cold) or ahead of it (prewarmed).')
+            lines.append('# TYPE bravia_first_request_duration_seconds histogram')
+            for (host, connection), stats in sorted(self._first.items()):
+                labels = _labels(host=host, connection=connection)
+                total = 0
+                for bound, count in zip([str(b) for b in stats.buckets] + ['+Inf'], stats.counts):
+                    total += count
+                    lines.append('bravia_first_request_duration_seconds_bucket{%s,le="%s"} %d'
+                                 % (labels, bound, total))
+                lines.append('bravia_first_request_duration_seconds_sum{%s} %r' % (labels, stats.seconds))
+                lines.append('bravia_first_request_duration_seconds_count{%s} %d' % (labels, stats.requests))
+
+            lines.append('# HELP bravia_responses_total Responses by HTTP status ("exception" if none).')
+            lines.append('# TYPE bravia_responses_total counter')
+            for (host, service, method), stats in items:
+                for status, count in sorted(stats.statuses.items(), key=str):
+                    lines.append('bravia_responses_total{%s} %d'
+                                 % (_labels(host=host, service=service, method=method, status=status), count))
+
+            lines.append('# HELP bravia_rpc_errors_total JSON-RPC error replies by error code.')
+            lines.append('# TYPE bravia_rpc_errors_total counter')
+            for (host, service, method), stats in items:
+                for code, count in sorted(stats.rpc_errors.items(), key=str):
+                    lines.append('bravia_rpc_errors_total{%s} %d'
+                                 % (_labels(host=host, service=service, method=method, code=code), count))
+
+            for name, attribute, kind, text in (
+                    ('bravia_request_bytes_total', 'bytes_sent', 'counter', 'Request body bytes sent.'),
+                    ('bravia_response_bytes_total', 'bytes_received', 'counter', 'Response body bytes received.'),
+                    ('bravia_requests_in_flight', 'in_flight', 'gauge', 'Requests waiting for a reply.')):
+                lines.append('# HELP %s %s' % (name, text))
+                lines.append('# TYPE %s %s' % (name, kind))
+                for (host, service, method), stats in items:
+                    lines.append('%s{%s} %d' % (name, _labels(host=host, service=service, method=method),
+                                                getattr(stats, attribute)))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,159 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Spoken numbers to integers, for en-us and es-es.
+
+    >>> parse_number("twenty three")
+    23
+    >>> parse_number("one oh four")
+    104
+    >>> parse_number("veintitrés", "es-es")
+    23
+    >>> parse_number("2-1")
+    21
+
+Numbers said digit by digit ("two one", "one twenty") are read the way
+channel numbers are: each group is written after the previous one.
+"""
+
+import re
+import unicodedata
+
+# Token kinds.
+DIGITS = 'digits'      # "104"
+UNIT = 'unit'          # 0-9
+TEEN = 'teen'          # 10-19, and the one-word Spanish 20-29
+TENS = 'tens'          # 20, 30 ... 90
+HUNDREDS = 'hundreds'  # Spanish "ciento", "doscientos" ...: add, then take tens and units
+HUNDRED = 'hundred'    # multiplies the group before it
+THOUSAND = 'thousand'  # multiplies the group before it
+ZERO = 'zero'          # the digit "oh"
+AND = 'and'            # "one hundred and four", "treinta y dos"
+A = 'a'                # "a hundred"
+
+# What may follow each kind inside the same number. Anything else starts a
+# new group, written after the current one.
+FOLLOWS = {
+    None: (UNIT, TEEN, TENS, HUNDREDS, HUNDRED, THOUSAND, A),
+    UNIT: (HUNDRED, THOUSAND),
+    TEEN: (HUNDRED, THOUSAND),
+    TENS: (UNIT, AND, HUNDRED, THOUSAND),
+    HUNDREDS: (UNIT, TEEN, TENS, AND, THOUSAND),
+    HUNDRED: (UNIT, TEEN, TENS, AND, THOUSAND),
+    THOUSAND: (UNIT, TEEN, TENS, HUNDREDS, AND),
+    AND: (UNIT, TEEN, TENS),
+    A: (HUNDRED, THOUSAND),
+    DIGITS: (),
+    ZERO: (),
+}
+
+
+def _table(*groups):
+    table = {}
+    for kind, words in groups:
+        for value, word in words:
+            for spelling in word.split('|'):
+                table[spelling] = (kind, value)
+    return table
+
+
+WORDS = {
+    'en': _table(
+        (UNIT, enumerate('zero one two three four five six seven eight nine'.split())),
+        (TEEN, enumerate('ten eleven twelve thirteen fourteen fifteen sixteen seventeen eighteen nineteen'.split(),
+                         10)),
+        (TENS, [(v * 10, w) for v, w in enumerate('twenty thirty forty fifty sixty seventy eighty ninety'.split(),
+                                                  2)]),
+        (HUNDRED, [(100, 'hundred')]),
+        (THOUSAND, [(1000, 'thousand')]),
+        (ZERO, [(0, 'oh|o')]),
+        (AND, [(0, 'and')]),
+        (A, [(1, 'a')]),
+    ),
+    'es': _table(
+        (UNIT, enumerate('cero uno|un|una dos tres cuatro cinco seis siete ocho nueve'.split())),
+        (TEEN, enumerate('diez once doce trece catorce quince dieciseis diecisiete dieciocho diecinueve veinte '
+                         'veintiuno|veintiun|veintiuna veintidos veintitres veinticuatro veinticinco veintiseis '
+                         'veintisiete veintiocho veintinueve'.split(), 10)),
+        (TENS, [(v * 10, w) for v, w in enumerate('treinta cuarenta cincuenta sesenta setenta ochenta '
+                                                  'noventa'.split(), 3)]),
+        (HUNDREDS, [(v * 100, w) for v, w in enumerate(
+            'cien|ciento doscientos|doscientas trescientos|trescientas cuatrocientos|cuatrocientas '
+            'quinientos|quinientas seiscientos|seiscientas setecientos|setecientas ochocientos|ochocientas '
+            'novecientos|novecientas'.split(), 1)]),
+        (THOUSAND, [(1000, 'mil')]),
+        (AND, [(0, 'y')]),
+    ),
+}
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def fold(text):
+    """Lowercase without accents: "Veintitrés" -> "veintitres"."""
+    return unicodedata.normalize('NFKD', text.lower()).encode('ascii', 'ignore').decode('ascii')
+
+
+def parse_number(text, lang='en-us'):
+    """The first number in `text` as an int, or None.
+
+    Words before the number are skipped and the number ends at the first
+    word that cannot be part of it.
+    """
+    words = WORDS.get(lang[:2].lower(), WORDS['en'])
+    tokens = _TOKEN.findall(fold(text))
+    digits = ''       # groups already finished, written one after the other
+    total = group = 0
+    last = None       # kind of the previous token of the current group
+    started = False
+    count = len(tokens)
+    for i in range(count):
+        token = tokens[i]
+        if token.isdigit():
+            kind, value = DIGITS, token
+        else:
+            kind, value = words.get(token, (None, None))
+            if kind is None or (kind == A and (i + 1 == count or words.get(tokens[i + 1], (None,))[0]
+                                                not in (HUNDRED, THOUSAND))):
+                if started:
+                    break
+                continue
+        if not started and kind == AND:
+            continue
+        started = True
+
+        if kind not in FOLLOWS[last]:
+            if last not in (None, DIGITS, ZERO):
+                digits += str(total + group)
+            total = group = 0
+            last = None
+            if kind in (DIGITS, ZERO):
+                digits += str(value)
+                last = kind
+                continue
+            if kind == AND:
+                break
+
+        if kind == HUNDRED:
+            group = (group or 1) * 100
+        elif kind == THOUSAND:
+            total += (group or 1) * 1000
+            group = 0
+        elif kind != AND:
+            group += value
+        last = kind
+
+    if last not in (None, DIGITS, ZERO):
+        digits += str(total + group)
+    return int(digits) if digits else None
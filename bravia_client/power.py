@@ -0,0 +1,134 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import threading
+import time
+
+from . import methods, result
+from .errors import BraviaError
+
+
+def magic_packet(mac):
+    mac_bytes = bytes.fromhex(mac.replace(':', '').replace('-', ''))
+    if len(mac_bytes) != 6:
+        raise ValueError('Not a MAC address: %s' % mac)
+    return b'\xff' * 6 + mac_bytes * 16
+
+
+def send_magic_packet(mac, address='255.255.255.255', port=9):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.sendto(magic_packet(mac), (address, port))
+    finally:
+        sock.close()
+
+
+class PowerOn(object):
+    """Wakes the TV, including from deep standby.
+
+    Sends a Wake-on-LAN packet at once when its MAC address is known and WoL
+    is not known to be off (both read from the response cache only), then
+    races setPowerStatus against getPowerStatus polls with exponential
+    backoff. While it runs, `executor` holds its queue, and the commands
+    queued meanwhile are sent as soon as the TV reports "active".
+    """
+
+    def __init__(self, client, executor=None, state=None, mac=None, wol_address='255.255.255.255',
+                 wol_port=9, deadline=30.0, first_poll=0.25, max_poll=4.0):
+        self.client = client
+        self.executor = executor
+        self.state = state
+        self.mac = mac
+        self.wol_address = wol_address
+        self.wol_port = wol_port
+        self.deadline = deadline
+        self.first_poll = first_poll
+        self.max_poll = max_poll
+        self.woke_with_wol = False
+
+    def _cached(self, method):
+        # Only what the cache already holds, even if expired: an asleep TV
+        # would make each request wait out the connect timeout.
+        response = self.client.cache.last(method)
+        if response is None:
+            return None
+        try:
+            return result(response)[0]
+        except (BraviaError, IndexError):
+            return None
+
+    def _known_mac(self):
+        if self.mac:
+            return self.mac
+        for interface in self._cached(methods.GET_NETWORK_SETTINGS) or ():
+            if interface.get("hwAddr"):
+                return interface["hwAddr"]
+        return None
+
+    def _wol_enabled(self):
+        return (self._cached(methods.GET_WOL_MODE) or {}).get("enabled")
+
+    def _send_power_on(self, done):
+        try:
+            result(self.client.set_power_status(True))
+        except (BraviaError, OSError):
+            return
+        done.set()
+
+    def _is_active(self):
+        # A probe: the TV is expected to be unreachable until it wakes, and
+        # its circuit breaker must not hold back the polls.
+        try:
+            return result(self.client.connection.probe())[0]["status"] == "active"
+        except (BraviaError, OSError, IndexError, KeyError):
+            return False
+
+    def run(self):
+        """Returns True once the TV is active, False if `deadline` passed."""
+        if self.executor is not None:
+            self.executor.hold()
+        try:
+            mac = self._known_mac()
+            self.woke_with_wol = bool(mac) and self._wol_enabled() is not False
+            if self.woke_with_wol:
+                try:
+                    send_magic_packet(mac, self.wol_address, self.wol_port)
+                except (OSError, ValueError):
+                    # No route or a bad MAC: setPowerStatus may still work.
+                    self.woke_with_wol = False
+
+            accepted = threading.Event()
+            threading.Thread(target=self._send_power_on, args=(accepted,),
+                             name='bravia-power-on', daemon=True).start()
+
+            end = time.monotonic() + self.deadline
+            delay = self.first_poll
+            while True:
+                if self._is_active():
+                    if self.state is not None:
+                        self.state.update(power="active")
+                        self.state.poke()
+                    return True
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                # A successful setPowerStatus means the TV is up: check again now.
+                if accepted.wait(min(delay, remaining)):
+                    accepted.clear()
+                delay = min(delay * 2, self.max_poll)
+        finally:
+            if self.executor is not None:
+                self.executor.release()
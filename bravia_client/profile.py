@@ -0,0 +1,137 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import threading
+import time
+
+from . import methods, result
+from .capabilities import Capabilities, parse_api_info
+from .errors import BraviaError
+
+# 2: 'apis' covers every service, not just system and avContent.
+FORMAT_VERSION = 2
+
+
+def fingerprint(system_information):
+    return [system_information.get(k, '') for k in ('model', 'serial', 'generation')]
+
+
+class DeviceProfile(object):
+    """What a TV can do, kept on disk between restarts.
+
+    The profile is read from `directory` the first time it is needed and
+    revalidated against the model, serial and firmware generation from
+    getSystemInformation. The full probe (supported APIs, remote controller
+    codes) only runs again when that fingerprint changes.
+    """
+
+    def __init__(self, directory, host, client):
+        self.path = os.path.join(directory, 'bravia-%s.json' % host.replace(':', '_'))
+        self.client = client
+        self._data = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def data(self):
+        with self._lock:
+            if not self._loaded:
+                self._data = self._read()
+                self._loaded = True
+            return self._data
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('format') != FORMAT_VERSION:
+            return None
+        return data
+
+    def _write(self, data):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    def probe(self, system_information=None):
+        if system_information is None:
+            system_information = result(self.client.get_system_information())[0]
+        data = {
+            'format': FORMAT_VERSION,
+            'fingerprint': fingerprint(system_information),
+            'probed_at': time.time(),
+            'system': system_information,
+            'apis': parse_api_info(result(self.client.get_supported_api_info(methods.SERVICES))[0]),
+            'remote_codes': {
+                code['name']: code['value'] for code in result(self.client.get_remote_controller_info())[1]
+            }
+        }
+        self._write(data)
+        with self._lock:
+            self._data = data
+            self._loaded = True
+        return data
+
+    def revalidate(self):
+        """Re-probe if the TV is not the one the profile describes.
+
+        Returns True when the profile was rewritten.
+        """
+        system_information = result(self.client.get_system_information())[0]
+        current = self.data
+        if current is not None and current['fingerprint'] == fingerprint(system_information):
+            return False
+        self.probe(system_information)
+        return True
+
+    def revalidate_in_background(self, on_error=None, on_done=None):
+        def run():
+            try:
+                self.revalidate()
+            except (BraviaError, OSError, KeyError, IndexError) as e:
+                if on_error is not None:
+                    on_error(e)
+                return
+            if on_done is not None:
+                on_done()
+
+        thread = threading.Thread(target=run, name='bravia-profile', daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def system_information(self):
+        data = self.data
+        return data['system'] if data else {}
+
+    @property
+    def remote_codes(self):
+        data = self.data
+        return data['remote_codes'] if data else {}
+
+    @property
+    def capabilities(self):
+        data = self.data
+        return Capabilities(data['apis']) if data else None
+
+    def supports(self, service, method):
+        data = self.data
+        if data is None:
+            return None
+        return method in data['apis'].get(service, {})
@@ -0,0 +1,531 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A simulated Bravia TV for offline testing and benchmarks.
+
+Serves the guide, appControl, audio, avContent, encryption, system and
+videoScreen JSON-RPC methods plus the IRCC endpoint over HTTP/1.1
+keep-alive, with stateful power, volume, channels and apps. Latency,
+jitter, errors and a connection limit can be injected. Run it with
+
+    python -m bravia_client.simulator --port 8080 --channels 1000
+"""
+
+import argparse
+import datetime
+import http.server
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+
+from . import methods
+
+ILLEGAL_ARGUMENT = 3
+ILLEGAL_STATE = 7
+NO_SUCH_METHOD = 12
+UNSUPPORTED_VERSION = 14
+DISPLAY_OFF = 40005
+SIMULATED_FAILURE = 40000
+
+# Services that answer "Display Is Turned off" while the TV is in standby.
+NEEDS_DISPLAY = ('audio', 'avContent', 'appControl', 'videoScreen')
+
+APPS = ['YouTube', 'Netflix', 'Prime Video', 'Spotify - Music', 'Google Play Movies & TV', 'Disney+',
+        'Plex', 'Twitch', 'BBC iPlayer', 'Media Player']
+
+REMOTE_KEYS = ['Num%d' % i for i in range(10)] + ['Confirm', 'Home', 'Return', 'Up', 'Down', 'Left', 'Right',
+                                                  'VolumeUp', 'VolumeDown', 'Mute', 'ChannelUp', 'ChannelDown',
+                                                  'Netflix', 'Input', 'PowerOff', 'WakeUp']
+
+
+def matches(params, template):
+    """Whether request params have the structure of a method's template:
+    the same object keys and array lengths, anything where it has a Param."""
+    if isinstance(template, methods.Param):
+        return True
+    if isinstance(template, dict):
+        return isinstance(params, dict) and params.keys() == template.keys() \
+            and all(matches(params[key], value) for key, value in template.items())
+    if isinstance(template, list):
+        return isinstance(params, list) and len(params) == len(template) \
+            and all(matches(p, t) for p, t in zip(params, template))
+    return not isinstance(params, (dict, list))
+
+
+class RpcFault(Exception):
+
+    def __init__(self, code, message):
+        super(RpcFault, self).__init__(message)
+        self.code = code
+        self.message = message
+
+
+class SimulatedTv(object):
+    """State and JSON-RPC method implementations of one simulated TV."""
+
+    def __init__(self, channels=100, power='active', volume=20, mac='02:00:00:00:b7:a0', versions=None):
+        self.power = power
+        self.volume = volume
+        self.mute = False
+        self.mac = mac
+        self.led = {"mode": "Demo", "status": "true"}
+        self.wol = True
+        self.power_saving = "off"
+        self.language = "eng"
+        self.scene = "auto"
+        self.text = ""
+        self.keys = []
+        self.channels = [{
+            "uri": "tv:dvbt?trip=9018.%d.%d&srvName=Channel %d" % (1000 + i, i, i + 1),
+            "title": "Channel %d" % (i + 1),
+            "index": i,
+            "dispNum": "%03d" % (i + 1),
+            "programMediaType": "tv",
+            "source": "tv:dvbt"
+        } for i in range(channels)]
+        self.apps = [{
+            "title": title,
+            "uri": "com.sony.dtv.%s" % ''.join(c for c in title.lower() if c.isalnum()),
+            "icon": "",
+            "data": ""
+        } for title in APPS]
+        self.inputs = [{
+            "uri": "extInput:hdmi?port=%d" % port,
+            "title": "HDMI %d" % port,
+            "label": "",
+            "icon": "meta:hdmi",
+            "connection": port == 1,
+            "status": "true" if port == 1 else ""
+        } for port in range(1, 5)]
+        self.playing = self.channels[0] if self.channels else None
+        self.versions = versions if versions is not None else {
+            name: [method.version] for name, method in methods.registry.items()
+        }
+        self._lock = threading.Lock()
+
+    def dispatch(self, service, name, params, version):
+        method = methods.registry.get(name)
+        if method is None or method.service != service or name not in self.versions:
+            raise RpcFault(NO_SUCH_METHOD, name)
+        if version not in self.versions[name]:
+            raise RpcFault(UNSUPPORTED_VERSION, 'Unsupported Version')
+        # Params are checked against the template of the version asked for,
+        # as a real TV would reject another version's request body.
+        template = method.templates.get(version)
+        if template is not None and not matches(params, template):
+            raise RpcFault(ILLEGAL_ARGUMENT, 'Illegal Argument')
+        if self.power != 'active' and service in NEEDS_DISPLAY:
+            raise RpcFault(DISPLAY_OFF, 'Display Is Turned off')
+        handler = getattr(self, name[0].lower() + name[1:])
+        with self._lock:
+            return handler(*(params[0:1] or [{}]))
+
+    # GUIDE SERVICE
+
+    def getSupportedApiInfo(self, params):
+        services = params.get("services") or sorted({m.service for m in methods.registry.values()})
+        return [[{
+            "service": service,
+            "protocols": ["xhrpost:jsonizer"],
+            "apis": [{
+                "name": name,
+                "versions": [{"version": v} for v in self.versions[name]]
+            } for name, method in methods.registry.items() if method.service == service and name in self.versions]
+        } for service in services]]
+
+    # APP CONTROL SERVICE
+
+    def getApplicationList(self, params):
+        return [self.apps]
+
+    def getApplicationStatusList(self, params):
+        return [[{"name": "textInput", "status": "on" if self.text else "off"},
+                 {"name": "cursorDisplay", "status": "off"},
+                 {"name": "webBrowse", "status": "off"}]]
+
+    def getTextForm(self, params):
+        return [{"text": self.text}]
+
+    def getWebAppStatus(self, params):
+        return [{"active": False, "url": ""}]
+
+    def setActiveApp(self, params):
+        app = next((app for app in self.apps if app["uri"] == params.get("uri")), None)
+        if app is None:
+            raise RpcFault(ILLEGAL_STATE, 'No such application')
+        self.playing = None
+        return []
+
+    def setTextForm(self, params):
+        # A bare string in v1.0.
+        self.text = params if isinstance(params, str) else params.get("text", "")
+        return []
+
+    def terminateApps(self, params):
+        return []
+
+    # AUDIO SERVICE
+
+    def getSoundSettings(self, params):
+        return [[{"target": "outputTerminal", "currentValue": "speaker"}]]
+
+    def getSpeakerSettings(self, params):
+        return [[{"target": "tvPosition", "currentValue": "tableTop"}]]
+
+    def getVolumeInformation(self, params):
+        return [[{"target": "speaker", "volume": self.volume, "mute": self.mute,
+                  "maxVolume": 100, "minVolume": 0}]]
+
+    def setAudioMute(self, params):
+        self.mute = bool(params.get("status"))
+        return []
+
+    def setAudioVolume(self, params):
+        volume = str(params.get("volume", ""))
+        try:
+            value = int(volume)
+        except ValueError:
+            raise RpcFault(3, 'Illegal Argument')
+        self.volume = max(0, min(100, self.volume + value if volume[:1] in '+-' else value))
+        return []
+
+    def setSoundSettings(self, params):
+        return []
+
+    def setSpeakerSettings(self, params):
+        return []
+
+    # AV CONTENT SERVICE
+
+    def getContentCount(self, params):
+        if params.get("source", "").startswith("tv"):
+            return [{"count": len(self.channels)}]
+        if params.get("source", "").startswith("extInput"):
+            return [{"count": len(self.inputs)}]
+        return [{"count": 0}]
+
+    def getContentList(self, params):
+        start = params.get("stIdx", 0)
+        count = params.get("cnt", 50)
+        if count > 200:
+            raise RpcFault(3, 'Illegal Argument')
+        # "source" in v1.0, "uri" from v1.2.
+        items = self.channels if params.get("uri", params.get("source", "")).startswith("tv") else self.inputs
+        return [items[start:start + count]]
+
+    def getCurrentExternalInputsStatus(self, params):
+        return [self.inputs]
+
+    def getSchemeList(self, params):
+        return [[{"scheme": "tv"}, {"scheme": "extInput"}]]
+
+    def getSourceList(self, params):
+        if params.get("scheme") == "tv":
+            return [[{"source": "tv:dvbt"}]]
+        return [[{"source": "extInput:hdmi"}]]
+
+    def getPlayingContentInfo(self, params):
+        if self.playing is None:
+            raise RpcFault(ILLEGAL_STATE, 'Illegal State')
+        return [dict(self.playing)]
+
+    def setPlayContent(self, params):
+        uri = params.get("uri")
+        item = next((item for item in self.channels + self.inputs if item["uri"] == uri), None)
+        if item is None:
+            raise RpcFault(ILLEGAL_STATE, 'No such content')
+        self.playing = item
+        return []
+
+    # ENCRYPTION SERVICE
+
+    def getPublicKey(self, params):
+        return [{"publicKey": "MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEAsimulated"}]
+
+    # SYSTEM SERVICE
+
+    def getCurrentTime(self, params):
+        return [datetime.datetime.now(datetime.timezone.utc).astimezone().isoformat(timespec='seconds')]
+
+    def getInterfaceInformation(self, params):
+        return [{"productCategory": "tv", "productName": "BRAVIA", "modelName": "KD-55SIM",
+                 "serverName": "", "interfaceVersion": "5.0.1"}]
+
+    def getLEDIndicatorStatus(self, params):
+        return [dict(self.led)]
+
+    def getNetworkSettings(self, params):
+        return [[{"netif": "eth0", "hwAddr": self.mac, "ipAddrV4": "127.0.0.1"}]]
+
+    def getPowerSavingMode(self, params):
+        return [{"mode": self.power_saving}]
+
+    def getPowerStatus(self, params):
+        return [{"status": self.power}]
+
+    def getRemoteControllerInfo(self, params):
+        return [{"bundled": True, "type": "RM-J1100"},
+                [{"name": key, "value": "AAAAAQAAAAEAAA%03dAw==" % i} for i, key in enumerate(REMOTE_KEYS)]]
+
+    def getRemoteDeviceSettings(self, params):
+        return [[{"target": "accessPermission", "currentValue": "on"}]]
+
+    def getSystemInformation(self, params):
+        return [{"product": "TV", "region": "EU", "language": self.language, "model": "KD-55SIM",
+                 "serial": "0000001", "macAddr": self.mac, "name": "BRAVIA", "generation": "5.2.0",
+                 "area": "GBR", "cid": ""}]
+
+    def getSystemSupportedFunction(self, params):
+        return [[{"option": "WOL", "value": self.mac}]]
+
+    def getWolMode(self, params):
+        return [{"enabled": self.wol}]
+
+    def requestReboot(self, params):
+        return []
+
+    def setLEDIndicatorStatus(self, params):
+        self.led = {"mode": params.get("mode"), "status": str(params.get("status")).lower()}
+        return []
+
+    def setLanguage(self, params):
+        self.language = params.get("language")
+        return []
+
+    def setPowerSavingMode(self, params):
+        self.power_saving = params.get("mode")
+        return []
+
+    def setPowerStatus(self, params):
+        self.power = "active" if params.get("status") else "standby"
+        return []
+
+    def setWolMode(self, params):
+        self.wol = bool(params.get("enabled"))
+        return []
+
+    # VIDEO SCREEN SERVICE
+
+    def setSceneSetting(self, params):
+        self.scene = params.get("value")
+        return []
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits on the client's delayed ACK on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body, content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        simulator = self.server.simulator
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        simulator.delay()
+        if self.headers.get('X-Auth-PSK') != simulator.psk:
+            self._reply(403, json.dumps({"error": [403, "Forbidden"]}).encode("UTF-8"))
+            return
+        if not self.path.startswith('/sony/'):
+            self._reply(404, b'')
+            return
+        service = self.path[len('/sony/'):]
+        if service == 'IRCC':
+            simulator.count('IRCC')
+            code = body.split(b'<IRCCCode>', 1)[-1].split(b'</IRCCCode>', 1)[0].decode('latin-1')
+            simulator.tv.keys.append(code)
+            self._reply(200, b'', 'text/xml; charset=UTF-8')
+            return
+
+        try:
+            request = json.loads(body)
+            request_id = request.get("id")
+            simulator.count(request.get("method"))
+            if simulator.inject_error(request.get("method")):
+                raise RpcFault(SIMULATED_FAILURE, 'Simulated failure')
+            reply = {"result": simulator.tv.dispatch(service, request.get("method"), request.get("params") or [],
+                                                     request.get("version")), "id": request_id}
+        except RpcFault as e:
+            reply = {"error": [e.code, e.message], "id": request_id}
+        except (ValueError, AttributeError):
+            self._reply(400, b'')
+            return
+        self._reply(200, json.dumps(reply).encode("UTF-8"))
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, simulator):
+        self.simulator = simulator
+        http.server.ThreadingHTTPServer.__init__(self, address, _Handler)
+
+    def process_request(self, request, client_address):
+        if not self.simulator.open_connection():
+            # Like the TV's embedded server: refuse what it cannot serve.
+            self.shutdown_request(request)
+            return
+        http.server.ThreadingHTTPServer.process_request(self, request, client_address)
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up mid-reply; that is not a server error.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            http.server.ThreadingHTTPServer.handle_error(self, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            http.server.ThreadingHTTPServer.process_request_thread(self, request, client_address)
+        finally:
+            self.simulator.close_connection()
+
+
+class BraviaSimulator(object):
+    """Serves a SimulatedTv on `host`:`port` (0 picks a free port).
+
+    Every request waits `latency` seconds plus up to `jitter` more. A fraction
+    `error_rate` of JSON-RPC calls fail with a generic error, and methods in
+    `failing` always do. Past `max_connections` open connections, new ones
+    are closed at once. With `wol_port` set, a magic packet on that UDP port
+    wakes the TV after `boot_time` seconds.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, psk='0000', tv=None, latency=0.0, jitter=0.0,
+                 error_rate=0.0, failing=(), max_connections=None, wol_port=None, boot_time=1.0, seed=None):
+        self.psk = psk
+        self.tv = tv if tv is not None else SimulatedTv()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.failing = set(failing)
+        self.max_connections = max_connections
+        self.boot_time = boot_time
+        self.requests = Counter()
+        self.connections = 0
+        self.refused = 0
+        self._open = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self)
+        self._threads = []
+        self._wol = None
+        if wol_port is not None:
+            self._wol = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._wol.bind((host, wol_port))
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return '%s:%d' % (host, port)
+
+    @property
+    def wol_address(self):
+        return self._wol.getsockname() if self._wol is not None else None
+
+    def delay(self):
+        with self._lock:
+            wait = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if wait:
+            time.sleep(wait)
+
+    def inject_error(self, method):
+        with self._lock:
+            return method in self.failing or (self.error_rate and self._random.random() < self.error_rate)
+
+    def count(self, method):
+        with self._lock:
+            self.requests[method] += 1
+
+    def open_connection(self):
+        with self._lock:
+            if self.max_connections is not None and self._open >= self.max_connections:
+                self.refused += 1
+                return False
+            self._open += 1
+            self.connections += 1
+            return True
+
+    def close_connection(self):
+        with self._lock:
+            self._open -= 1
+
+    def _listen_wol(self):
+        while True:
+            try:
+                data = self._wol.recv(1024)
+            except OSError:
+                return
+            if data[:6] == b'\xff' * 6:
+                threading.Timer(self.boot_time, self.tv.setPowerStatus, args=({"status": True},)).start()
+
+    def start(self):
+        thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), name='bravia-simulator',
+                                  daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        if self._wol is not None:
+            thread = threading.Thread(target=self._listen_wol, name='bravia-simulator-wol', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._wol is not None:
+            self._wol.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulated Sony Bravia TV')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--psk', default='0000')
+    parser.add_argument('--channels', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-connections', type=int)
+    parser.add_argument('--wol-port', type=int)
+    args = parser.parse_args()
+    simulator = BraviaSimulator(args.host, args.port, args.psk, SimulatedTv(args.channels), args.latency,
+                                args.jitter, args.error_rate, max_connections=args.max_connections,
+                                wol_port=args.wol_port).start()
+    print('Simulated Bravia TV on http://%s/sony/ (PSK %s)' % (simulator.address, simulator.psk))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
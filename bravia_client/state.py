@@ -0,0 +1,150 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from . import result
+from .errors import BraviaError, RpcError
+
+FIELDS = ('power', 'volume', 'max_volume', 'mute', 'input', 'content')
+
+
+class StateMirror(object):
+    """In-memory copy of the TV's power, volume (and its maximum), mute,
+    input and content.
+
+    A background thread polls every `fast_interval` seconds for
+    `fast_period` seconds after poke() (call it after sending a command),
+    every `slow_interval` seconds otherwise, and only checks the power
+    status every `standby_interval` seconds while the TV is in standby
+    (never, if None, until the next poke()). Values older than
+    `max_staleness` seconds read as None.
+    """
+
+    def __init__(self, client, fast_interval=1.0, slow_interval=30.0, fast_period=10.0,
+                 standby_interval=60.0, max_staleness=120.0):
+        self.client = client
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.fast_period = fast_period
+        self.standby_interval = standby_interval
+        self.max_staleness = max_staleness
+        self.last_error = None
+        self._values = dict.fromkeys(FIELDS)
+        self._updated = dict.fromkeys(FIELDS, 0)
+        self._subscribers = []
+        self._poked_at = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # READING
+
+    def get(self, field, max_age=None):
+        max_age = self.max_staleness if max_age is None else max_age
+        with self._lock:
+            if time.monotonic() - self._updated[field] > max_age:
+                return None
+            return self._values[field]
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def subscribe(self, callback):
+        """Call `callback(field, old, new)` whenever a value changes."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    # UPDATING
+
+    def update(self, **values):
+        now = time.monotonic()
+        changes = []
+        with self._lock:
+            for field, value in values.items():
+                old = self._values[field]
+                self._values[field] = value
+                self._updated[field] = now
+                if old != value:
+                    changes.append((field, old, value))
+        for change in changes:
+            for callback in list(self._subscribers):
+                callback(*change)
+
+    def invalidate(self, field):
+        """Make `field` read as None until the next update, e.g. after a
+        command that was expected to change it failed."""
+        with self._lock:
+            self._updated[field] = 0
+
+    def poll(self):
+        power = result(self.client.get_power_status())[0]["status"]
+        if power != "active":
+            self.update(power=power)
+            return
+
+        volume = result(self.client.get_volume_information())[0]
+        speaker = next((v for v in volume if v.get("target") == "speaker"), volume[0] if volume else {})
+        try:
+            content = result(self.client.get_playing_content_info())[0]
+        except RpcError:
+            # The TV answers with an error while an app is in the foreground.
+            content = None
+        self.update(power=power,
+                    volume=speaker.get("volume"),
+                    max_volume=speaker.get("maxVolume"),
+                    mute=speaker.get("mute"),
+                    input=content.get("source") if content else None,
+                    content=content)
+
+    # SCHEDULING
+
+    def poke(self):
+        self._poked_at = time.monotonic()
+        self._wake.set()
+
+    def next_interval(self):
+        if self._values['power'] not in (None, 'active'):
+            return self.standby_interval
+        if time.monotonic() - self._poked_at < self.fast_period:
+            return self.fast_interval
+        return self.slow_interval
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                self.poll()
+                self.last_error = None
+            except (BraviaError, OSError, KeyError, IndexError) as e:
+                self.last_error = e
+            self._wake.wait(self.next_interval())
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='bravia-state', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
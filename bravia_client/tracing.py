@@ -0,0 +1,131 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+_current = contextvars.ContextVar('bravia_span', default=None)
+
+
+class _NoSpan(object):
+    """What span() returns while tracing is off."""
+    id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+class Span(object):
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'id', 'parent', 'start', '_token')
+
+    def __init__(self, tracer, name, cat, parent, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.id = next(tracer._ids)
+        self.parent = parent
+        self.start = None
+        self._token = None
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.args['error'] = repr(exc)
+        self.tracer.record(self.name, self.start, time.monotonic(), self.cat, self.parent, _id=self.id, **self.args)
+        return False
+
+
+class Tracer(object):
+    """Collects timed spans and writes them as a Chrome trace.
+
+    Off by default: span() then returns a shared no-op context manager, so
+    instrumented code pays one attribute check. Spans opened inside another
+    on the same thread (or asyncio task) record it as their parent. Work
+    handed to another thread can pass `parent=` explicitly. Only the newest
+    `max_events` spans are kept. Times come from time.monotonic(), like the
+    command queue's.
+    """
+
+    def __init__(self, max_events=100000):
+        self.enabled = False
+        self.events = deque(maxlen=max_events)
+        self._ids = itertools.count(1)
+        self._epoch = time.monotonic()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def current(self):
+        return _current.get() if self.enabled else None
+
+    def span(self, name, cat='bravia', parent=None, **args):
+        if not self.enabled:
+            return NO_SPAN
+        return Span(self, name, cat, parent or _current.get(), args)
+
+    def record(self, name, start, end, cat='bravia', parent=None, _id=None, **args):
+        """Add a span that has already happened, e.g. time spent queued."""
+        if not self.enabled:
+            return
+        args['id'] = next(self._ids) if _id is None else _id
+        if parent is not None:
+            args['parent'] = parent.id
+        self.events.append({
+            'name': name,
+            'cat': cat,
+            'ph': 'X',
+            'ts': (start - self._epoch) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args
+        })
+
+    def clear(self):
+        self.events.clear()
+
+    def export(self, path):
+        """Write the spans to `path` for chrome://tracing or Perfetto."""
+        with self._lock:
+            events = list(self.events)
+            tmp = path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, separators=(',', ':'))
+            os.replace(tmp, path)
+        return len(events)
+
+
+# The tracer every module reports to.
+tracer = Tracer()
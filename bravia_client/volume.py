@@ -0,0 +1,127 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from .errors import BraviaError
+from .tracing import tracer
+
+STEP = 2
+# Used until getVolumeInformation has reported the TV's maxVolume.
+MAX_VOLUME = 100
+
+
+class VolumeController(object):
+    """Merges relative volume changes that arrive close together.
+
+    Steps requested within `window` seconds of the first one are summed and
+    sent as a single setAudioVolume call. When `state` (a StateMirror) read
+    the volume less than `max_age` seconds ago, the call sets the absolute
+    target instead of a relative change, and the mirror is updated straight
+    away (and invalidated if the call fails). An older reading may predate a
+    change made on the TV's own remote, so the change is then sent as
+    relative. With an `executor` the call is queued behind the TV's other
+    commands instead of sent from the timer thread.
+    """
+
+    def __init__(self, client, state=None, window=0.4, step=STEP, on_error=None, executor=None, max_age=2.0):
+        self.client = client
+        self.state = state
+        self.max_age = max_age
+        self.executor = executor
+        self.window = window
+        self.step = step
+        self.on_error = on_error
+        self.requested = 0
+        self.sent = 0
+        self._delta = 0
+        self._timer = None
+        self._trace_parent = None
+        self._lock = threading.Lock()
+
+    @property
+    def rpcs_saved(self):
+        return self.requested - self.sent
+
+    def up(self, steps=1):
+        self.change(steps * self.step)
+
+    def down(self, steps=1):
+        self.change(-steps * self.step)
+
+    def change(self, delta):
+        with self._lock:
+            self.requested += 1
+            self._delta += delta
+            if self._timer is None:
+                self._trace_parent = tracer.current()
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            delta, self._delta = self._delta, 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if delta == 0:
+                return None
+            self.sent += 1
+            parent, self._trace_parent = self._trace_parent, None
+
+        with tracer.span('volume.flush', 'volume', parent, delta=delta):
+            return self._send(delta)
+
+    def _send(self, delta):
+        current = self.state.get('volume', self.max_age) if self.state is not None else None
+        if current is not None:
+            maximum = self.state.get('max_volume', float('inf')) or MAX_VOLUME
+            target = max(0, min(maximum, current + delta))
+            volume = str(target)
+            self.state.update(volume=target)
+        else:
+            volume = '%+d' % delta
+        if self.executor is not None:
+            self.executor.submit(self.client.set_audio_volume, volume,
+                                 on_done=self._sent, on_error=self._failed)
+            return None
+        try:
+            response = self.client.set_audio_volume(volume)
+        except (BraviaError, OSError) as e:
+            self._failed(e)
+            if self.on_error is None:
+                raise
+            return None
+        self._sent(response)
+        return response
+
+    def _sent(self, response):
+        if self.state is not None:
+            self.state.poke()
+
+    def _failed(self, error):
+        if self.state is not None:
+            # The mirror already holds the target: read the real volume again.
+            self.state.invalidate('volume')
+            self.state.poke()
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def stats(self):
+        return {
+            'requested': self.requested,
+            'sent': self.sent,
+            'saved': self.rpcs_saved
+        }
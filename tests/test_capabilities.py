@@ -0,0 +1,58 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from bravia_client import methods, result
+from bravia_client.client import BraviaClient
+from bravia_client.errors import RpcError, UnsupportedMethodError
+from bravia_client.simulator import ILLEGAL_ARGUMENT, BraviaSimulator, SimulatedTv
+
+
+class OlderTvTest(unittest.TestCase):
+    """A TV that only lists v1.0 of methods this package sends newer."""
+
+    def setUp(self):
+        versions = {name: [method.version] for name, method in methods.registry.items()}
+        versions.update(getContentList=['1.0'], setAudioVolume=['1.0'], setTextForm=['1.0'],
+                        getCurrentTime=['1.0'])
+        self.simulator = BraviaSimulator(tv=SimulatedTv(channels=5, versions=versions)).start()
+        self.client = BraviaClient(self.simulator.address, self.simulator.psk)
+        self.client.negotiate()
+
+    def tearDown(self):
+        self.client.close()
+        self.simulator.stop()
+
+    def test_sends_the_older_params(self):
+        self.assertEqual(len(result(self.client.get_content_list('tv:dvbt', 0, 5))[0]), 5)
+        result(self.client.set_audio_volume('30'))
+        result(self.client.set_text_form('hello'))
+        self.assertEqual((self.simulator.tv.volume, self.simulator.tv.text), (30, 'hello'))
+
+    def test_version_without_known_params_is_unsupported(self):
+        with self.assertRaises(UnsupportedMethodError):
+            self.client.get_current_time()
+        self.assertNotIn('getCurrentTime', self.simulator.requests)
+
+    def test_simulator_rejects_another_versions_params(self):
+        relabelled = dict(method="getContentList", id=1, version="1.0",
+                          params=[{"uri": "tv:dvbt", "stIdx": 0, "cnt": 5}])
+        with self.assertRaises(RpcError) as raised:
+            result(self.client.post_request('avContent', relabelled))
+        self.assertEqual(raised.exception.code, ILLEGAL_ARGUMENT)
+
+
+if __name__ == '__main__':
+    unittest.main()
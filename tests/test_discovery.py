@@ -0,0 +1,117 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import http.server
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from bravia_client.discovery import SCALAR_WEB_API, DeviceRegistry, SsdpDiscovery
+
+DESCRIPTION = b'''<?xml version="1.0"?>
+<root xmlns="urn:schemas-upnp-org:device-1-0" xmlns:av="urn:schemas-sony-com:av">
+  <device>
+    <friendlyName>Living room</friendlyName>
+    <modelName>KD-55XH9096</modelName>
+    <serialNumber>4012345</serialNumber>
+    <UDN>uuid:00000000-0000-1010-8000-0242ac110002</UDN>
+    <av:X_ScalarWebAPI_DeviceInfo>
+      <av:X_ScalarWebAPI_BaseURL>http://127.0.0.1:8080/sony</av:X_ScalarWebAPI_BaseURL>
+    </av:X_ScalarWebAPI_DeviceInfo>
+  </device>
+</root>
+'''
+
+
+class _Description(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path != '/dmr.xml':
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(DESCRIPTION)))
+        self.end_headers()
+        self.wfile.write(DESCRIPTION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Responder(object):
+    """Answers one M-SEARCH for the ScalarWebAPI like a TV would."""
+
+    def __init__(self, path):
+        self.http = http.server.HTTPServer(('127.0.0.1', 0), _Description)
+        self.location = 'http://127.0.0.1:%d%s' % (self.http.server_address[1], path)
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind(('127.0.0.1', 0))
+        self.address = self.udp.getsockname()
+        self.searches = []
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+        threading.Thread(target=self._answer, daemon=True).start()
+
+    def _answer(self):
+        data, sender = self.udp.recvfrom(2048)
+        self.searches.append(data)
+        self.udp.sendto(('HTTP/1.1 200 OK\r\n'
+                         'CACHE-CONTROL: max-age=1800\r\n'
+                         'LOCATION: %s\r\n'
+                         'ST: %s\r\n'
+                         'USN: uuid:00000000-0000-1010-8000-0242ac110002::%s\r\n'
+                         '\r\n' % (self.location, SCALAR_WEB_API, SCALAR_WEB_API)).encode('latin-1'), sender)
+
+    def close(self):
+        self.http.shutdown()
+        self.http.server_close()
+        self.udp.close()
+
+
+class SsdpDiscoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.registry = DeviceRegistry(os.path.join(self.directory, 'devices.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def search(self, path, identify=None):
+        responder = Responder(path)
+        try:
+            found = SsdpDiscovery(self.registry, identify=identify, timeout=0.5,
+                                  address=responder.address).search()
+        finally:
+            responder.close()
+        self.assertIn(SCALAR_WEB_API.encode('latin-1'), responder.searches[0])
+        return found
+
+    def test_keys_by_serial_and_uses_the_base_url(self):
+        self.assertEqual(self.search('/dmr.xml'), ['4012345'])
+        self.assertEqual(self.registry.host('4012345'), '127.0.0.1:8080')
+        self.assertEqual(self.registry.get('4012345')['name'], 'Living room')
+        self.assertEqual(DeviceRegistry(self.registry.path).devices().keys(), {'4012345'})
+
+    def test_without_a_description_asks_identify(self):
+        self.assertEqual(self.search('/missing.xml', identify=lambda host: 'mac:' + host), ['mac:127.0.0.1'])
+        self.assertEqual(self.registry.host('mac:127.0.0.1'), '127.0.0.1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from bravia_client.executor import INPUT, CommandExecutor
+
+
+class Tv(object):
+    """Stands in for bravia_client: records the calls the executor makes."""
+
+    def __init__(self):
+        self.calls = []
+        self.done = threading.Event()
+
+    def command(self, name):
+        def func(*args):
+            self.calls.append((name, args))
+        func.__name__ = name
+        return func
+
+    def finished(self, value=None):
+        self.done.set()
+
+
+class CommandQueueMergeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tv = Tv()
+        self.executor = CommandExecutor()
+        self.executor.hold()
+
+    def tearDown(self):
+        self.executor.stop()
+
+    def run_queue(self):
+        self.executor.release()
+        self.assertTrue(self.tv.done.wait(5))
+
+    def test_power_on_then_off_turns_off(self):
+        self.executor.submit(self.tv.command('power_on'))
+        self.executor.submit(self.tv.command('power_off'), on_done=self.tv.finished)
+        self.run_queue()
+        self.assertEqual(self.tv.calls, [('power_off', ())])
+
+    def test_app_then_channel_tunes_the_channel(self):
+        self.executor.submit(self.tv.command('set_active_app'), 'com.sony.dtv.netflix')
+        self.executor.submit(self.tv.command('send_channel'), '5', priority=INPUT, key='input',
+                             on_done=self.tv.finished)
+        self.run_queue()
+        self.assertEqual(self.tv.calls, [('send_channel', ('5',))])
+
+    def test_merged_command_takes_the_new_priority(self):
+        self.executor.submit(self.tv.command('set_audio_volume'), '10')
+        self.executor.submit(self.tv.command('set_power_saving_mode'), 'low', key='power')
+        self.executor.submit(self.tv.command('power_off'), on_done=self.tv.finished)
+        self.run_queue()
+        self.assertEqual(self.tv.calls[0], ('power_off', ()))
+
+
+class CommandExecutorErrorTest(unittest.TestCase):
+
+    def test_worker_survives_an_unexpected_error(self):
+        tv = Tv()
+        errors = []
+        executor = CommandExecutor()
+        try:
+            # Called with a missing argument: a TypeError, not a BraviaError.
+            executor.submit(lambda on: None, on_error=errors.append)
+            executor.submit(tv.command('mute'), on_done=tv.finished)
+            self.assertTrue(tv.done.wait(5))
+        finally:
+            executor.stop()
+        self.assertIsInstance(errors[0], TypeError)
+        self.assertEqual(tv.calls, [('mute', ())])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import doctest
+import unittest
+
+from bravia_client import numbers
+from bravia_client.numbers import parse_number
+
+CASES = {
+    'en-us': [
+        ('7', 7),
+        ('seven', 7),
+        ('twenty three', 23),
+        ('one oh four', 104),
+        ('2-1', 21),
+        ('one twenty three', 123),
+        ('one hundred and four', 104),
+        ('a hundred', 100),
+        ('two thousand one hundred five', 2105),
+        ('twenty twenty', 2020),
+        ('five and then', 5),
+        ('number nine please', 9),
+        ('hello', None),
+        ('', None),
+    ],
+    'es-es': [
+        ('siete', 7),
+        ('veintitrés', 23),
+        ('treinta y dos', 32),
+        ('cien', 100),
+        ('ciento cuatro', 104),
+        ('doscientos uno', 201),
+        ('quinientos cincuenta y cinco', 555),
+        ('uno cero cuatro', 104),
+        ('mil doscientos', 1200),
+        ('dos mil', 2000),
+        ('siete por favor', 7),
+        ('el cinco', 5),
+    ],
+}
+
+
+class ParseNumberTest(unittest.TestCase):
+
+    def test_cases(self):
+        for lang, cases in CASES.items():
+            for text, number in cases:
+                with self.subTest(lang=lang, text=text):
+                    self.assertEqual(parse_number(text, lang), number)
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(numbers))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# Copyright 2021, David Giral
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+
+from bravia_client.client import BraviaClient
+from bravia_client.power import PowerOn
+from bravia_client.simulator import BraviaSimulator, SimulatedTv
+
+
+class PowerOnTest(unittest.TestCase):
+
+    def setUp(self):
+        # setPowerStatus always fails: only the magic packet can wake it.
+        self.simulator = BraviaSimulator(tv=SimulatedTv(power='standby'), failing=('setPowerStatus',),
+                                         wol_port=0, boot_time=0.2).start()
+        self.client = BraviaClient(self.simulator.address, self.simulator.psk)
+
+    def tearDown(self):
+        self.client.close()
+        self.simulator.stop()
+
+    def test_wakes_with_wol(self):
+        host, port = self.simulator.wol_address
+        power_on = PowerOn(self.client, mac=self.simulator.tv.mac, wol_address=host, wol_port=port,
+                           deadline=5.0, first_poll=0.05)
+        self.assertTrue(power_on.run())
+        self.assertTrue(power_on.woke_with_wol)
+        self.assertEqual(self.simulator.tv.power, 'active')
+
+    def test_gives_up_at_the_deadline_without_a_mac(self):
+        power_on = PowerOn(self.client, deadline=0.5, first_poll=0.05)
+        self.assertFalse(power_on.run())
+        self.assertFalse(power_on.woke_with_wol)
+        self.assertEqual(self.simulator.tv.power, 'standby')
+
+
+if __name__ == '__main__':
+    unittest.main()